@@ -1,7 +1,7 @@
 import os
 import json
 import logging
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime, timezone
 from openai import OpenAI
 from pydantic import BaseModel
@@ -18,30 +18,28 @@ class AIService:
         
         self.client = OpenAI(api_key=api_key)
     
-    def _prepare_file_data(self, files: List[Dict], folders: List[Dict]) -> str:
-        """Prepare file and folder data for LLM analysis"""
-        file_data = []
-        
-        # Add folders
+    def _iter_file_entries(self, files: List[Dict], folders: List[Dict]) -> Iterator[Dict]:
+        """Yield each folder's, then each file's entry for the prompt"""
         for folder in folders:
-            file_data.append({
+            yield {
                 "id": folder.get("id"),
                 "name": folder.get("name", "Unknown"),
                 "type": "folder",
                 "parent": folder.get("parents", [""])[0] if folder.get("parents") else "root"
-            })
+            }
         
-        # Add files
         for file in files:
-            file_data.append({
+            yield {
                 "id": file.get("id"),
                 "name": file.get("name", "Unknown"),
                 "type": "file",
                 "mime_type": file.get("mimeType", ""),
                 "parent": file.get("parents", [""])[0] if file.get("parents") else "root"
-            })
-        
-        return json.dumps(file_data, indent=2)
+            }
+    
+    def _prepare_file_data(self, files: List[Dict], folders: List[Dict]) -> str:
+        """Prepare file and folder data for LLM analysis"""
+        return json.dumps(list(self._iter_file_entries(files, folders)), indent=2)
     
     def _create_analysis_prompt(self, file_data: str) -> str:
         """Create the LLM prompt for drive analysis"""
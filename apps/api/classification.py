@@ -228,7 +228,7 @@ def _validate_file_ids(proposal: Dict, valid_file_ids: set):
     def check_folder(folder):
         for file_id in folder.get('files', []):
             if file_id not in valid_file_ids:
-                logger.warning(f"Invalid file ID in proposal: {file_id}")
+                logger.warning("Invalid file ID in proposal", file_id=file_id)
         
         for child in folder.get('children', []):
             check_folder(child)
@@ -238,7 +238,7 @@ def _validate_file_ids(proposal: Dict, valid_file_ids: set):
     
     for file_id in proposal.get('orphaned_files', []):
         if file_id not in valid_file_ids:
-            logger.warning(f"Invalid file ID in orphaned files: {file_id}")
+            logger.warning("Invalid file ID in orphaned files", file_id=file_id)
 
 def summarize_large_file_list(metadata: List[Dict], max_files: int = 4000) -> List[Dict]:
     """
@@ -1,8 +1,12 @@
 """Google Drive API client wrapper with retry logic and error handling."""
 
+import random
+import threading
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
+import httplib2
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
@@ -11,6 +15,21 @@ import structlog
 
 logger = structlog.get_logger(__name__)
 
+# One keep-alive httplib2 connection pool per worker thread
+_thread_local = threading.local()
+
+# Rate-limited and transiently failing requests are retried with exponential
+# backoff and jitter, honoring Retry-After when Drive sends it. Server errors
+# are only retried for idempotent requests; see _is_idempotent.
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 60
+SERVER_ERROR_STATUSES = (500, 502, 503, 504)
+RATE_LIMIT_REASONS = (b'rateLimitExceeded', b'userRateLimitExceeded')
+
+# Drive represents folders as files with this MIME type
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
 # If modifying these scopes, delete the file token.json.
 SCOPES = [
     'https://www.googleapis.com/auth/drive.metadata.readonly',
@@ -48,17 +67,230 @@ def build_service(user_credentials: Dict) -> 'Resource':
         if credentials.expired and credentials.refresh_token:
             credentials.refresh(Request())
         
-        service = build('drive', 'v3', credentials=credentials)
+        # Use the discovery document bundled with googleapiclient; no network fetch or cache
+        service = build('drive', 'v3', credentials=credentials, static_discovery=True, cache_discovery=False)
         return service
         
     except Exception as e:
         logger.error("Failed to build Drive service", error=str(e))
         raise DriveClientError(f"Failed to build Drive service: {str(e)}")
 
+def execute_request(request: 'HttpRequest') -> Dict:
+    """
+    Execute a Drive API request on the calling thread's HTTP connection.
+    
+    httplib2 connections are not thread-safe, so requests executed from
+    worker threads (e.g. via asyncio.to_thread) must not share the
+    service's transport. Each thread keeps its own connection alive and
+    reuses it, so repeat calls skip the TCP and TLS handshakes.
+    
+    Rate limits, and transient server errors on idempotent requests, are
+    retried with backoff.
+    
+    Args:
+        request: Unexecuted googleapiclient request
+        
+    Returns:
+        Deserialized API response
+    """
+    return _with_retry(
+        lambda: request.execute(http=_authorized_http(request.http.credentials)),
+        idempotent=_is_idempotent(request)
+    )
+
+def _with_retry(call, idempotent: bool = True):
+    """Run call, retrying retryable HttpErrors up to MAX_RETRIES times."""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return call()
+        except HttpError as error:
+            if attempt == MAX_RETRIES or not _is_retryable(error, idempotent):
+                raise
+            _backoff(error, attempt)
+
+def _is_idempotent(request: 'HttpRequest') -> bool:
+    """Return whether re-sending a request can't duplicate its effect.
+    
+    Creates are POSTs: Drive can commit one and still answer with a 5xx, so
+    sending it again would make a second item. Gets, lists and parent
+    updates (PATCH) end in the same state however often they are sent.
+    """
+    return getattr(request, 'method', 'GET') != 'POST'
+
+def _is_retryable(error: HttpError, idempotent: bool = True) -> bool:
+    """Return whether a failed request is worth retrying."""
+    status = error.resp.status
+    if status == 429:
+        return True
+    if status == 403:
+        # 403 is also used for permission errors; only retry rate limits
+        return any(reason in (error.content or b'') for reason in RATE_LIMIT_REASONS)
+    # A 5xx may come after the change was made; only repeat safe requests
+    return idempotent and status in SERVER_ERROR_STATUSES
+
+def _backoff(error: HttpError, attempt: int):
+    """Sleep before retry number attempt + 1."""
+    retry_after = error.resp.get('retry-after', '')
+    if retry_after.isdigit():
+        delay = min(RETRY_MAX_DELAY, int(retry_after))
+    else:
+        delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) + random.random() * 0.3
+    logger.warning("Drive request failed, retrying", status=error.resp.status, delay=delay, retry_count=attempt + 1)
+    time.sleep(delay)
+
+def _authorized_http(credentials) -> AuthorizedHttp:
+    """Return an authorized transport over this thread's connection."""
+    return AuthorizedHttp(credentials, http=_thread_http())
+
+def _thread_http() -> httplib2.Http:
+    """Return this thread's httplib2.Http, creating it on first use."""
+    http = getattr(_thread_local, 'http', None)
+    if http is None:
+        http = _thread_local.http = httplib2.Http(timeout=30)
+    return http
+
+# Drive accepts up to 100 calls per batch, but starts answering batched
+# list requests with 500s well before that
+BATCH_REQUEST_LIMIT = 25
+
+def escape_query_value(value: str) -> str:
+    """Escape a string for use inside single quotes in a Drive query."""
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
+def execute_batch(service: 'Resource', requests: List['HttpRequest']) -> List[Union[Dict, Exception]]:
+    """
+    Execute Drive API requests as one multipart/mixed batch request.
+    
+    Requests are sent in chunks of BATCH_REQUEST_LIMIT, each chunk costing
+    a single round-trip on the calling thread's connection. Requests that
+    fail with a retryable error are re-sent together after a backoff;
+    creates are only re-sent after rate limits, never after server errors.
+    
+    Args:
+        service: Google Drive service resource
+        requests: Unexecuted googleapiclient requests
+        
+    Returns:
+        Responses in request order, with the exception in place of the
+        response where that request failed
+        
+    Raises:
+        DriveClientError: If a batch request itself fails
+    """
+    responses: List[Union[Dict, Exception]] = [None] * len(requests)
+    errors: Dict[int, Exception] = {}
+    
+    def on_response(request_id, response, exception):
+        if exception is not None:
+            errors[int(request_id)] = exception
+            return
+        errors.pop(int(request_id), None)
+        responses[int(request_id)] = response
+    
+    # A failed batch may still have applied some of its parts
+    batch_idempotent = all(_is_idempotent(request) for request in requests)
+    
+    try:
+        pending = list(range(len(requests)))
+        for attempt in range(MAX_RETRIES + 1):
+            for start in range(0, len(pending), BATCH_REQUEST_LIMIT):
+                batch = service.new_batch_http_request(callback=on_response)
+                for index in pending[start:start + BATCH_REQUEST_LIMIT]:
+                    batch.add(requests[index], request_id=str(index))
+                http = _authorized_http(requests[pending[start]].http.credentials)
+                _with_retry(lambda: batch.execute(http=http), idempotent=batch_idempotent)
+            
+            retryable = [
+                index for index in pending
+                if isinstance(errors.get(index), HttpError)
+                and _is_retryable(errors[index], _is_idempotent(requests[index]))
+            ]
+            if not retryable or attempt == MAX_RETRIES:
+                break
+            _backoff(errors[retryable[0]], attempt)
+            pending = retryable
+        
+        for index, error in errors.items():
+            logger.error("Batched Drive request failed", request_id=index, error=str(error))
+            responses[index] = error
+        return responses
+        
+    except Exception as e:
+        logger.error("Failed to execute batch request", error=str(e))
+        raise DriveClientError(f"Failed to execute batch request: {str(e)}")
+
+def find_folders_batch(service: 'Resource', names: List[str], parent_id: Optional[str] = None) -> Dict[str, Optional[str]]:
+    """
+    Look up folders by name with one batch request instead of one list per name.
+    
+    Args:
+        service: Google Drive service resource
+        names: Folder names to look up
+        parent_id: Only match folders inside this parent (optional)
+        
+    Returns:
+        Dictionary mapping each name to its folder ID, or None if no such
+        folder exists. Names whose lookup failed are left out.
+        
+    Raises:
+        DriveClientError: If the batch request fails
+    """
+    requests = []
+    for name in names:
+        query = f"name='{escape_query_value(name)}' and mimeType='{FOLDER_MIME_TYPE}' and trashed=false"
+        if parent_id:
+            query += f" and '{parent_id}' in parents"
+        requests.append(service.files().list(
+            q=query, fields="files(id)", pageSize=1, spaces="drive", corpora="user"
+        ))
+    
+    folders = {}
+    for name, response in zip(names, execute_batch(service, requests)):
+        if isinstance(response, Exception):
+            continue
+        files = response.get('files', [])
+        folders[name] = files[0]['id'] if files else None
+    return folders
+
+def create_folders_batch(service: 'Resource', names: List[str], parent_id: Optional[str] = None) -> Dict[str, str]:
+    """
+    Create folders with one batch request instead of one create per name.
+    
+    Args:
+        service: Google Drive service resource
+        names: Names of the folders to create
+        parent_id: ID of the parent folder (optional)
+        
+    Returns:
+        Dictionary mapping each created name to its new folder ID. Names
+        whose creation failed are left out.
+        
+    Raises:
+        DriveClientError: If the batch request fails
+    """
+    requests = []
+    for name in names:
+        folder_metadata = {
+            'name': name,
+            'mimeType': FOLDER_MIME_TYPE
+        }
+        if parent_id:
+            folder_metadata['parents'] = [parent_id]
+        requests.append(service.files().create(body=folder_metadata, fields='id'))
+    
+    return {
+        name: response['id']
+        for name, response in zip(names, execute_batch(service, requests))
+        if not isinstance(response, Exception)
+    }
+
 def list_files(service: 'Resource', page_size: int = 1000, page_token: Optional[str] = None, mime_type: Optional[str] = None, max_results: Optional[int] = None) -> Dict:
     """
     List files in Google Drive with pagination and retry logic.
     
+    Requests go through execute_request, so listing can run from worker
+    threads and rate-limited requests are retried there with backoff.
+    
     Args:
         service: Google Drive service resource
         page_size: Number of files to fetch per request
@@ -72,70 +304,53 @@ def list_files(service: 'Resource', page_size: int = 1000, page_token: Optional[
     Raises:
         DriveClientError: If API calls fail after retries
     """
-    max_retries = 3
-    base_delay = 1
-    
     try:
-        retry_count = 0
-        while retry_count < max_retries:
-            try:
-                # Build query parameters
-                query_params = {
-                    'pageSize': page_size,
-                    'fields': "nextPageToken, files(id, name, mimeType, parents, createdTime, modifiedTime, size, webViewLink)"
-                }
-                
-                if page_token:
-                    query_params['pageToken'] = page_token
-                
-                if mime_type:
-                    query_params['q'] = f"mimeType='{mime_type}'"
-                
-                # Call the Drive v3 API
-                results = service.files().list(**query_params).execute()
-                
-                items = results.get('files', [])
-                
-                # Apply max_results limit if specified
-                if max_results and len(items) > max_results:
-                    items = items[:max_results]
-                    # Remove nextPageToken if we're limiting results
-                    results.pop('nextPageToken', None)
-                
-                logger.info("Successfully listed files", count=len(items))
-                return results
-                
-            except HttpError as error:
-                retry_count += 1
-                if error.resp.status in [403, 429]:  # Rate limit or quota exceeded
-                    if retry_count < max_retries:
-                        delay = base_delay * (2 ** (retry_count - 1))  # Exponential backoff
-                        logger.warning(f"Rate limited, retrying in {delay}s", retry_count=retry_count)
-                        time.sleep(delay)
-                        continue
-                    else:
-                        logger.error("Max retries exceeded for rate limit", error=str(error))
-                        raise DriveClientError(f"Rate limit exceeded after {max_retries} retries")
-                else:
-                    logger.error("Drive API error", error=str(error))
-                    raise DriveClientError(f"Drive API error: {str(error)}")
-                    
-            except Exception as e:
-                logger.error("Unexpected error listing files", error=str(e))
-                raise DriveClientError(f"Unexpected error: {str(e)}")
-                    
+        # Build query parameters
+        query_params = {
+            'pageSize': page_size,
+            'fields': "nextPageToken, files(id, name, mimeType, parents, createdTime, modifiedTime, size, webViewLink)"
+        }
+        
+        if page_token:
+            query_params['pageToken'] = page_token
+        
+        if mime_type:
+            query_params['q'] = f"mimeType='{mime_type}'"
+        
+        # Call the Drive v3 API; execute_request retries rate limits
+        results = execute_request(service.files().list(**query_params))
+        
+        items = results.get('files', [])
+        
+        # Apply max_results limit if specified
+        if max_results and len(items) > max_results:
+            items = items[:max_results]
+            # Remove nextPageToken if we're limiting results
+            results.pop('nextPageToken', None)
+        
+        logger.info("Successfully listed files", count=len(items))
+        return results
+        
+    except HttpError as error:
+        logger.error("Drive API error", error=str(error))
+        raise DriveClientError(f"Drive API error: {str(error)}")
     except Exception as e:
         logger.error("Failed to list files", error=str(e))
         raise DriveClientError(f"Failed to list files: {str(e)}")
 
-def move_item(service: 'Resource', file_id: str, new_parent_id: str) -> Dict:
+def move_item(service: 'Resource', file_id: str, new_parent_id: str, current_parents: Optional[List[str]] = None) -> Dict:
     """
     Move a file or folder to a new parent folder.
     
+    Requests go through execute_request, so moves can run concurrently
+    from worker threads.
+    
     Args:
         service: Google Drive service resource
         file_id: ID of the file/folder to move
         new_parent_id: ID of the new parent folder
+        current_parents: The item's current parent IDs, e.g. from
+            get_parents_batch; fetched with an extra request when omitted
         
     Returns:
         Updated file metadata
@@ -145,16 +360,18 @@ def move_item(service: 'Resource', file_id: str, new_parent_id: str) -> Dict:
     """
     try:
         # Get the current parents
-        file = service.files().get(fileId=file_id, fields='parents').execute()
-        previous_parents = ",".join(file.get('parents', []))
+        if current_parents is None:
+            file = execute_request(service.files().get(fileId=file_id, fields='parents'))
+            current_parents = file.get('parents', [])
+        previous_parents = ",".join(current_parents)
         
         # Move the file to the new folder
-        file = service.files().update(
+        file = execute_request(service.files().update(
             fileId=file_id,
             addParents=new_parent_id,
             removeParents=previous_parents,
             fields='id, name, parents'
-        ).execute()
+        ))
         
         logger.info("Successfully moved file", file_id=file_id, new_parent_id=new_parent_id)
         return file
@@ -166,6 +383,71 @@ def move_item(service: 'Resource', file_id: str, new_parent_id: str) -> Dict:
         logger.error("Unexpected error moving file", file_id=file_id, error=str(e))
         raise DriveClientError(f"Unexpected error moving file: {str(e)}")
 
+def get_parents_batch(service: 'Resource', file_ids: List[str]) -> Dict[str, Union[List[str], Exception]]:
+    """
+    Read the current parents of many files with batch requests.
+    
+    Args:
+        service: Google Drive service resource
+        file_ids: IDs of the files/folders
+        
+    Returns:
+        Dictionary mapping each file ID to its parent IDs, or to the
+        exception if that lookup failed
+        
+    Raises:
+        DriveClientError: If a batch request itself fails
+    """
+    file_ids = list(dict.fromkeys(file_ids))
+    files = execute_batch(service, [
+        service.files().get(fileId=file_id, fields='parents') for file_id in file_ids
+    ])
+    return {
+        file_id: file if isinstance(file, Exception) else file.get('parents', [])
+        for file_id, file in zip(file_ids, files)
+    }
+
+def move_items_batch(service: 'Resource', moves: List[Tuple[str, str]]) -> List[Optional[str]]:
+    """
+    Move files to new parent folders with batch requests.
+    
+    Current parents are read with one batch of gets, then all moves are
+    sent as one batch of updates, instead of two requests per file.
+    
+    Args:
+        service: Google Drive service resource
+        moves: (file_id, new_parent_id) pairs
+        
+    Returns:
+        An error message per move, in order; None where the move succeeded
+        
+    Raises:
+        DriveClientError: If a batch request itself fails
+    """
+    parents = get_parents_batch(service, [file_id for file_id, _ in moves])
+    
+    errors: List[Optional[str]] = [None] * len(moves)
+    updates = []
+    update_indexes = []
+    for index, (file_id, new_parent_id) in enumerate(moves):
+        if isinstance(parents[file_id], Exception):
+            errors[index] = f"Failed to move file: {str(parents[file_id])}"
+            continue
+        updates.append(service.files().update(
+            fileId=file_id,
+            addParents=new_parent_id,
+            removeParents=",".join(parents[file_id]),
+            fields='id, parents'
+        ))
+        update_indexes.append(index)
+    
+    for index, response in zip(update_indexes, execute_batch(service, updates)):
+        if isinstance(response, Exception):
+            errors[index] = f"Failed to move file: {str(response)}"
+    
+    logger.info("Moved files in batch", count=errors.count(None), failed=len(moves) - errors.count(None))
+    return errors
+
 def get_file_metadata(service: 'Resource', file_id: str) -> Dict:
     """
     Get detailed metadata for a specific file.
@@ -213,7 +495,7 @@ def create_folder(service: 'Resource', name: str, parent_id: Optional[str] = Non
     try:
         folder_metadata = {
             'name': name,
-            'mimeType': 'application/vnd.google-apps.folder'
+            'mimeType': FOLDER_MIME_TYPE
         }
         
         if parent_id:
@@ -1,30 +1,65 @@
 """Main FastAPI application for Drive Organizer."""
 
+import asyncio
+import functools
+import hashlib
+import logging
+import logging.handlers
 import os
+import queue
+import sys
+import threading
+import time
 import uuid
-from typing import Dict, List, Optional
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 import structlog
-from supabase import create_client
+import orjson
+from cachetools import LRUCache, TTLCache
+import asyncpg
+import httpx
+from supabase import Client
+from supabase.lib.client_options import ClientOptions
+from postgrest import SyncPostgrestClient
+from postgrest.utils import SyncClient
 import openai
 from dotenv import load_dotenv
 
 # Load environment variables from root directory
 load_dotenv("../../.env")
 
-from drive_client import build_service, list_files, move_item, create_folder, DriveClientError
+from drive_client import (
+    build_service, execute_request, list_files, move_item, move_items_batch, get_parents_batch,
+    find_folders_batch, create_folders_batch, escape_query_value, BATCH_REQUEST_LIMIT, FOLDER_MIME_TYPE,
+    DriveClientError
+)
 from classification import propose_structure, summarize_large_file_list
 
-# Configure logging
+# Configure logging. The root logger only enqueues records; a QueueListener
+# thread does the actual stream writes so handlers never block the event loop.
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(message)s",
+    handlers=[logging.handlers.QueueHandler(log_queue)]
+)
+
+# make_filtering_bound_logger turns calls below INFO into no-ops before any
+# processor runs or any event dict is built.
 structlog.configure(
     processors=[
-        structlog.stdlib.filter_by_level,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
@@ -33,17 +68,65 @@ structlog.configure(
     ],
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
+    wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
     cache_logger_on_first_use=True,
 )
 
 logger = structlog.get_logger(__name__)
 
+# Event loop: prefer io_uring via uringcore (Linux 5.11+ only), fall back to
+# uvloop, then to the default asyncio loop. UVICORN_LOOP tells uvicorn not to
+# replace the policy installed here.
+try:
+    import uringcore
+    asyncio.set_event_loop_policy(uringcore.EventLoopPolicy())
+    UVICORN_LOOP = "none"
+except ImportError:
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        UVICORN_LOOP = "uvloop"
+    except ImportError:
+        UVICORN_LOOP = "asyncio"
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Environment configuration, read once at import."""
+    supabase_url: Optional[str]
+    supabase_anon_key: Optional[str]
+    google_client_id: Optional[str]
+    google_client_secret: Optional[str]
+    google_access_token: Optional[str]
+    google_refresh_token: Optional[str]
+    openai_api_key: Optional[str]
+    frontend_url: str
+    database_url: Optional[str]
+    drive_folder_concurrency: int
+    drive_move_concurrency: int
+    drive_worker_threads: int
+
+SETTINGS = Settings(
+    supabase_url=os.getenv("SUPABASE_URL"),
+    supabase_anon_key=os.getenv("SUPABASE_ANON_KEY"),
+    google_client_id=os.getenv("GOOGLE_CLIENT_ID"),
+    google_client_secret=os.getenv("GOOGLE_CLIENT_SECRET"),
+    google_access_token=os.getenv("GOOGLE_ACCESS_TOKEN"),
+    google_refresh_token=os.getenv("GOOGLE_REFRESH_TOKEN"),
+    openai_api_key=os.getenv("OPENAI_API_KEY"),
+    frontend_url=os.getenv("FRONTEND_URL", "https://your-app.vercel.app"),
+    database_url=os.getenv("DATABASE_URL"),
+    # Semaphores and thread pools need at least one slot; 0 would hang or fail
+    drive_folder_concurrency=max(1, int(os.getenv("DRIVE_FOLDER_CONCURRENCY", "8"))),
+    drive_move_concurrency=max(1, int(os.getenv("DRIVE_MOVE_CONCURRENCY", "10"))),
+    drive_worker_threads=max(1, int(os.getenv("DRIVE_WORKER_THREADS", "32"))),
+)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Drive Organizer API",
     description="AI-powered Google Drive file organization",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -52,55 +135,168 @@ app.add_middleware(
     allow_origins=[
         "http://localhost:3000",
         "https://localhost:3000",
-        "https://*.vercel.app",
-        "https://*.railway.app",
-        "https://*.render.com",
-        "https://*.fly.dev",
-        os.getenv("FRONTEND_URL", "https://your-app.vercel.app")  # Add your actual domain
+        SETTINGS.frontend_url  # Add your actual domain
     ],
+    # Starlette only matches allow_origins literally; hosted preview domains
+    # go through a single precompiled regex instead
+    allow_origin_regex=r"https://[\w-]+(\.[\w-]+)*\.(vercel\.app|railway\.app|render\.com|fly\.dev)",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-# Initialize Supabase client
-supabase_url = os.getenv("SUPABASE_URL")
-supabase_key = os.getenv("SUPABASE_ANON_KEY")
-
-# Debug environment variables
-logger.info(f"SUPABASE_URL from env: {repr(supabase_url)}")
-logger.info(f"SUPABASE_ANON_KEY from env: {repr(supabase_key[:20]) if supabase_key else 'None'}...")
+# Compress JSON responses (scan results and file listings can run to several MB);
+# level 5 gets close to the best ratio at about twice the speed of level 9
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
-# Validate required environment variables
-if not supabase_url or not supabase_key:
+# Validate required environment variables once; the app refuses to start
+# without a working Supabase client, so request paths never see None
+if not SETTINGS.supabase_url or not SETTINGS.supabase_anon_key:
     logger.error("SUPABASE_URL and SUPABASE_ANON_KEY must be set in environment variables")
     raise ValueError("SUPABASE_URL and SUPABASE_ANON_KEY must be set in environment variables")
 
-logger.info(f"Final SUPABASE_URL: {repr(supabase_url)}")
-logger.info(f"Final SUPABASE_ANON_KEY: {repr(supabase_key[:20])}...")
+# Every PostgREST call goes through one keep-alive connection pool. The cap
+# keeps concurrent scans from exhausting Supabase's connection pooler; calls
+# beyond it wait up to the pool timeout for a free connection. HTTP/2 lets
+# concurrent calls share connections as multiplexed streams.
+SUPABASE_TIMEOUT = 30
+SUPABASE_HTTP_LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=10, keepalive_expiry=30)
 
-# Initialize Supabase client with error handling
-try:
-    supabase = create_client(supabase_url, supabase_key)
-    logger.info("✅ Supabase client initialized successfully")
-except Exception as e:
-    logger.error(f"❌ Failed to initialize Supabase client: {e}")
-    import traceback
-    logger.error(f"Traceback: {traceback.format_exc()}")
-    supabase = None
+class PooledPostgrestClient(SyncPostgrestClient):
+    """PostgREST client whose HTTP/2 session uses SUPABASE_HTTP_LIMITS."""
+    
+    def create_session(self, base_url, headers, timeout):
+        return SyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            limits=SUPABASE_HTTP_LIMITS,
+            http2=True
+        )
+
+class PooledSupabaseClient(Client):
+    """Supabase client that builds its PostgREST client with a bounded pool."""
+    
+    @staticmethod
+    def _init_postgrest_client(rest_url, headers, schema, timeout=SUPABASE_TIMEOUT):
+        return PooledPostgrestClient(rest_url, headers=headers, schema=schema, timeout=timeout)
+
+# Initialize Supabase client
+supabase = PooledSupabaseClient(
+    SETTINGS.supabase_url,
+    SETTINGS.supabase_anon_key,
+    options=ClientOptions(
+        postgrest_client_timeout=SUPABASE_TIMEOUT,
+        storage_client_timeout=SUPABASE_TIMEOUT
+    )
+)
+logger.info("✅ Supabase client initialized successfully", supabase_url=SETTINGS.supabase_url)
+
+async def _execute(query):
+    """Run a supabase-py query without blocking the event loop.
+    
+    The client is synchronous, so each request runs in a worker thread.
+    """
+    return await asyncio.to_thread(query.execute)
+
+# Drive calls can sleep for up to a minute in rate-limit backoff, so they get
+# their own threads instead of starving _execute on the default executor
+DRIVE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=SETTINGS.drive_worker_threads, thread_name_prefix="drive"
+)
+
+async def _run_drive(func, *args, **kwargs):
+    """Run a blocking Drive call on the dedicated Drive thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(DRIVE_EXECUTOR, functools.partial(func, *args, **kwargs))
 
 # Configure OpenAI
-openai.api_key = os.getenv("OPENAI_API_KEY")
+openai.api_key = SETTINGS.openai_api_key
 
 # Security
 security = HTTPBearer()
 
+# Drive's alias for the top of the user's My Drive. Organized folders live
+# there, so existence lookups are scoped to it instead of the whole Drive.
+DRIVE_ROOT_ID = "root"
+
+# Scanned items are written in chunks of this many rows, a few chunks at a time
+DB_INSERT_CHUNK_SIZE = 1000
+DB_INSERT_CONCURRENCY = 4
+
+# With DATABASE_URL set, scans buffer this many rows and write them with
+# Postgres COPY instead of PostgREST inserts; smaller writes still use inserts
+COPY_MIN_ROWS = 5000
+
+# Rows per read; Supabase's PostgREST caps responses at 1000 rows by default
+DB_PAGE_SIZE = 1000
+
+# Minimum seconds between AI analysis progress writes; phases that finish
+# sooner than this skip their progress update
+AI_PROGRESS_UPDATE_INTERVAL = 2.0
+
+# drive_files/drive_folders columns aliased back to Drive API field names
+DRIVE_FILE_COLUMNS = "id:drive_id,name,mimeType:mime_type,size,parents,createdTime:created_time,modifiedTime:modified_time,webViewLink:web_view_link"
+DRIVE_FOLDER_COLUMNS = "id:drive_id,name,parents,createdTime:created_time,modifiedTime:modified_time,webViewLink:web_view_link"
+
+# Encoded /api/drive/files pages keyed by (user_id, page_token, page_size).
+# Paging back and forth in the UI re-requests the same pages, so they are
+# served from memory for a minute. TTLCache is not thread-safe on its own.
+_PAGE_CACHE = TTLCache(maxsize=1024, ttl=60)
+_PAGE_CACHE_LOCK = threading.Lock()
+
+# Completed AI proposals never change, so their encoded body and ETag are
+# kept per (analysis_id, user_id) and repeat polls skip the database.
+_PROPOSAL_CACHE = LRUCache(maxsize=1024)
+_PROPOSAL_CACHE_LOCK = threading.Lock()
+
+def _invalidate_drive_page_cache(user_id: str) -> None:
+    """Drop cached Drive listing pages after a user's files have moved."""
+    with _PAGE_CACHE_LOCK:
+        for key in [key for key in _PAGE_CACHE.keys() if key[0] == user_id]:
+            _PAGE_CACHE.pop(key, None)
+
+# Google OAuth tokens and built Drive services, reused per user until just
+# before the access token expires (and for at most GOOGLE_CREDENTIALS_MAX_AGE).
+# A per-user lock keeps concurrent requests from refreshing the same token.
+# All three are bounded and only touched from the event loop, so they need no
+# thread lock; a lock evicted while held only costs a duplicate refresh.
+GOOGLE_CREDENTIALS_MAX_AGE = timedelta(minutes=30)
+_google_tokens_cache = TTLCache(maxsize=1024, ttl=GOOGLE_CREDENTIALS_MAX_AGE.total_seconds())
+_drive_service_cache = TTLCache(maxsize=1024, ttl=GOOGLE_CREDENTIALS_MAX_AGE.total_seconds())
+_google_credentials_locks = TTLCache(maxsize=1024, ttl=GOOGLE_CREDENTIALS_MAX_AGE.total_seconds())
+
+def _google_credentials_lock(user_id: str) -> asyncio.Lock:
+    """Return the lock guarding a user's token refresh, creating it if needed."""
+    lock = _google_credentials_locks.get(user_id)
+    if lock is None:
+        lock = _google_credentials_locks[user_id] = asyncio.Lock()
+    return lock
+
+def _invalidate_google_credentials(user_id: str) -> None:
+    """Forget a user's cached tokens and Drive service."""
+    _google_tokens_cache.pop(user_id, None)
+    _drive_service_cache.pop(user_id, None)
+
+def _is_unauthorized(error: Union[Exception, str]) -> bool:
+    """Whether a (possibly wrapped) Drive API error was a 401."""
+    return "HttpError 401" in str(error)
+
 # Pydantic models
+class ResponseModel(BaseModel):
+    """Base for models the API only emits; frozen, no assignment validation."""
+    model_config = ConfigDict(
+        frozen=True,
+        validate_assignment=False,
+        extra="ignore",
+        arbitrary_types_allowed=False
+    )
+
 class IngestRequest(BaseModel):
     """Request model for metadata ingestion."""
     pass
 
-class IngestResponse(BaseModel):
+class IngestResponse(ResponseModel):
     """Response model for metadata ingestion."""
     task_id: str
     status: str
@@ -110,7 +306,7 @@ class ProposeRequest(BaseModel):
     """Request model for structure proposal."""
     snapshot_id: str
 
-class ProposeResponse(BaseModel):
+class ProposeResponse(ResponseModel):
     """Response model for structure proposal."""
     proposal_id: str
     proposal: Dict
@@ -120,7 +316,7 @@ class ApplyRequest(BaseModel):
     """Request model for applying structure."""
     proposal_id: str
 
-class ApplyResponse(BaseModel):
+class ApplyResponse(ResponseModel):
     """Response model for applying structure."""
     success: bool
     message: str
@@ -130,7 +326,7 @@ class UndoRequest(BaseModel):
     """Request model for undo operation."""
     log_id: str
 
-class UndoResponse(BaseModel):
+class UndoResponse(ResponseModel):
     """Response model for undo operation."""
     success: bool
     message: str
@@ -141,12 +337,12 @@ class PreferencesRequest(BaseModel):
     ignore_large: bool = False
     max_file_size_mb: int = 100
 
-class PreferencesResponse(BaseModel):
+class PreferencesResponse(ResponseModel):
     """Response model for user preferences."""
     preferences: Dict
 
 # Google Drive API models
-class DriveFile(BaseModel):
+class DriveFile(ResponseModel):
     """Model for Google Drive file."""
     id: str
     name: str
@@ -157,7 +353,7 @@ class DriveFile(BaseModel):
     parents: List[str] = []
     web_view_link: str = ""
 
-class DriveFolder(BaseModel):
+class DriveFolder(ResponseModel):
     """Model for Google Drive folder."""
     id: str
     name: str
@@ -172,7 +368,7 @@ class DriveScanRequest(BaseModel):
     include_files: bool = True
     max_results: int = 1000
 
-class DriveScanResponse(BaseModel):
+class DriveScanResponse(ResponseModel):
     """Response model for Drive scan."""
     scan_id: str
     status: str
@@ -180,19 +376,19 @@ class DriveScanResponse(BaseModel):
     file_count: int = 0
     folder_count: int = 0
 
-class DriveFilesResponse(BaseModel):
+class DriveFilesResponse(ResponseModel):
     """Response model for Drive files list."""
     files: List[DriveFile]
     next_page_token: str = None
     total_count: int
 
-class DriveFoldersResponse(BaseModel):
+class DriveFoldersResponse(ResponseModel):
     """Response model for Drive folders list."""
     folders: List[DriveFolder]
     next_page_token: str = None
     total_count: int
 
-class DriveScanStatusResponse(BaseModel):
+class DriveScanStatusResponse(ResponseModel):
     """Response model for Drive scan status."""
     scan_id: str
     status: str
@@ -202,21 +398,21 @@ class DriveScanStatusResponse(BaseModel):
     error_message: Optional[str] = None
     completed_at: Optional[str] = None
 
-class TreeNode(BaseModel):
+class TreeNode(ResponseModel):
     """Model for tree node structure."""
     id: str
     name: str
     type: str  # 'file' or 'folder'
-    mime_type: str = None
-    size: int = None
-    created_time: str = None
-    modified_time: str = None
+    mime_type: Optional[str] = None
+    size: Optional[int] = None
+    created_time: Optional[str] = None
+    modified_time: Optional[str] = None
     parents: List[str] = []
     web_view_link: str = ""
     children: List['TreeNode'] = []
     level: int = 0
 
-class ScanResultsResponse(BaseModel):
+class ScanResultsResponse(ResponseModel):
     """Response model for scan results with tree structure."""
     scan_id: str
     status: str
@@ -228,7 +424,7 @@ class ScanResultsResponse(BaseModel):
     folders: List[DriveFolder] = []
 
 
-class AIProposal(BaseModel):
+class AIProposal(ResponseModel):
     """AI-generated organization proposal"""
     scan_id: str
     generated_at: str
@@ -240,13 +436,13 @@ class AIAnalysisRequest(BaseModel):
     """Request model for AI analysis"""
     scan_id: str
 
-class AIAnalysisResponse(BaseModel):
+class AIAnalysisResponse(ResponseModel):
     """Response model for AI analysis"""
     analysis_id: str
     status: str
     message: str
 
-class AIAnalysisStatusResponse(BaseModel):
+class AIAnalysisStatusResponse(ResponseModel):
     """Response model for AI analysis status"""
     analysis_id: str
     status: str
@@ -256,17 +452,56 @@ class AIAnalysisStatusResponse(BaseModel):
 
 # Dependency to get current user
 async def get_google_oauth_tokens(user_id: str) -> Dict:
-    """Get Google OAuth tokens from database with automatic refresh."""
+    """Get Google OAuth tokens for a user, served from cache while still valid."""
+    cached = _google_tokens_cache.get(user_id)
+    if cached and datetime.now(timezone.utc) < cached[1]:
+        return cached[0]
+    
+    async with _google_credentials_lock(user_id):
+        # Another request may have loaded the tokens while we waited
+        cached = _google_tokens_cache.get(user_id)
+        if cached and datetime.now(timezone.utc) < cached[1]:
+            return cached[0]
+        
+        tokens, expires_at_dt = await _load_google_oauth_tokens(user_id)
+        valid_until = min(
+            expires_at_dt - timedelta(seconds=60),
+            datetime.now(timezone.utc) + GOOGLE_CREDENTIALS_MAX_AGE
+        )
+        _google_tokens_cache[user_id] = (tokens, valid_until)
+        return tokens
+
+async def get_drive_service(user_id: str, user_credentials: Dict):
+    """Return the user's Drive service, building it only when not cached."""
+    cached = _drive_service_cache.get(user_id)
+    if cached and datetime.now(timezone.utc) < cached[1]:
+        return cached[0]
+    
+    async with _google_credentials_lock(user_id):
+        cached = _drive_service_cache.get(user_id)
+        if cached and datetime.now(timezone.utc) < cached[1]:
+            return cached[0]
+        
+        service = await _run_drive(build_service, user_credentials)
+        # Expire together with the tokens the service was built from
+        _, valid_until = _google_tokens_cache.get(
+            user_id, (None, datetime.now(timezone.utc) + GOOGLE_CREDENTIALS_MAX_AGE)
+        )
+        _drive_service_cache[user_id] = (service, valid_until)
+        return service
+
+async def _load_google_oauth_tokens(user_id: str) -> Tuple[Dict, datetime]:
+    """Get Google OAuth tokens and their expiry from database with automatic refresh."""
     try:
-        client_id = os.getenv("GOOGLE_CLIENT_ID")
-        client_secret = os.getenv("GOOGLE_CLIENT_SECRET")
+        client_id = SETTINGS.google_client_id
+        client_secret = SETTINGS.google_client_secret
         
         if not client_id or not client_secret:
             logger.error("Google OAuth credentials not configured in environment")
             raise Exception("Google OAuth credentials not configured. Please set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET.")
         
         # Get tokens from database
-        response = supabase.table("google_tokens").select("*").eq("user_id", user_id).execute()
+        response = await _execute(supabase.table("google_tokens").select("access_token,refresh_token,expires_at").eq("user_id", user_id))
         
         if not response.data:
             logger.warning("No Google tokens found for user", user_id=user_id)
@@ -275,25 +510,23 @@ async def get_google_oauth_tokens(user_id: str) -> Dict:
         token_data = response.data[0]
         access_token = token_data["access_token"]
         refresh_token = token_data["refresh_token"]
-        expires_at = token_data["expires_at"]
+        # timestamptz column, serialized by PostgREST as an offset-aware ISO string
+        expires_at_dt = datetime.fromisoformat(token_data["expires_at"])
         
         # Check if token needs refresh (expires in next 2 minutes)
-        from datetime import datetime, timedelta, timezone
-        now = datetime.now(timezone.utc)
-        expires_at_dt = datetime.fromisoformat(expires_at.replace('Z', '+00:00'))
-        
-        if now > expires_at_dt - timedelta(minutes=2):
+        if datetime.now(timezone.utc) > expires_at_dt - timedelta(minutes=2):
             logger.info("Refreshing Google OAuth token", user_id=user_id)
             new_tokens = await refresh_google_token(refresh_token)
             
             # Update database with new tokens
-            supabase.table("google_tokens").update({
+            await _execute(supabase.table("google_tokens").update({
                 "access_token": new_tokens["access_token"],
                 "expires_at": new_tokens["expires_at"],
                 "updated_at": "now()"
-            }).eq("user_id", user_id).execute()
+            }).eq("user_id", user_id))
             
             access_token = new_tokens["access_token"]
+            expires_at_dt = datetime.fromisoformat(new_tokens["expires_at"])
         
         logger.info("Successfully retrieved Google OAuth tokens", user_id=user_id)
         
@@ -303,7 +536,7 @@ async def get_google_oauth_tokens(user_id: str) -> Dict:
             "client_id": client_id,
             "client_secret": client_secret,
             "token_uri": "https://oauth2.googleapis.com/token"
-        }
+        }, expires_at_dt
         
     except Exception as e:
         logger.error("Failed to get Google OAuth tokens", error=str(e))
@@ -311,13 +544,11 @@ async def get_google_oauth_tokens(user_id: str) -> Dict:
 
 async def refresh_google_token(refresh_token: str) -> Dict:
     """Refresh Google OAuth token."""
-    import httpx
     import time
-    from datetime import datetime
     
     payload = {
-        "client_id": os.getenv("GOOGLE_CLIENT_ID"),
-        "client_secret": os.getenv("GOOGLE_CLIENT_SECRET"),
+        "client_id": SETTINGS.google_client_id,
+        "client_secret": SETTINGS.google_client_secret,
         "refresh_token": refresh_token,
         "grant_type": "refresh_token",
     }
@@ -329,17 +560,14 @@ async def refresh_google_token(refresh_token: str) -> Dict:
         
         return {
             "access_token": data["access_token"],
-            "expires_at": datetime.fromtimestamp(time.time() + data["expires_in"]).isoformat() + "Z"
+            "expires_at": datetime.fromtimestamp(time.time() + data["expires_in"], tz=timezone.utc).isoformat()
         }
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict:
     """Get current user from JWT token."""
-    if supabase is None:
-        raise HTTPException(status_code=503, detail="Authentication service unavailable")
-    
     try:
         # Verify the JWT token with Supabase
-        user = supabase.auth.get_user(credentials.credentials)
+        user = await asyncio.to_thread(supabase.auth.get_user, credentials.credentials)
         # Convert User object to dictionary
         return {
             "id": user.user.id,
@@ -351,6 +579,41 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         logger.error("Failed to authenticate user", error=str(e))
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
 
+@app.on_event("startup")
+async def start_log_listener():
+    """Start the background thread that drains the logging queue."""
+    log_listener.start()
+
+@app.on_event("shutdown")
+async def stop_log_listener():
+    """Flush queued log records and stop the listener thread."""
+    log_listener.stop()
+
+# Direct Postgres connections, only used for COPY-based bulk ingest
+_pg_pool: Optional[asyncpg.Pool] = None
+
+@app.on_event("startup")
+async def open_pg_pool():
+    """Open the Postgres pool when DATABASE_URL is configured."""
+    global _pg_pool
+    if SETTINGS.database_url:
+        # Supabase's transaction pooler does not support prepared statements
+        _pg_pool = await asyncpg.create_pool(
+            SETTINGS.database_url, min_size=2, max_size=5, statement_cache_size=0
+        )
+        logger.info("Opened Postgres pool for bulk ingest")
+
+@app.on_event("shutdown")
+async def close_pg_pool():
+    """Close the Postgres pool if one was opened."""
+    if _pg_pool is not None:
+        await _pg_pool.close()
+
+@app.on_event("shutdown")
+async def stop_drive_executor():
+    """Shut down the Drive thread pool."""
+    DRIVE_EXECUTOR.shutdown(wait=False)
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -373,9 +636,8 @@ async def store_google_token(
     try:
         logger.info("Received token storage request", user_id=current_user["id"])
         
-        # Convert expires_at from timestamp to ISO format
-        from datetime import datetime
-        expires_at = datetime.fromtimestamp(body.expires_at / 1000).isoformat() + "Z"
+        # Convert expires_at from a millisecond timestamp to a UTC timestamptz value
+        expires_at = datetime.fromtimestamp(body.expires_at / 1000, tz=timezone.utc).isoformat()
         
         logger.info("Token data", 
                    user_id=current_user["id"],
@@ -384,13 +646,14 @@ async def store_google_token(
                    expires_at=expires_at)
         
         # Upsert tokens into database
-        supabase.table("google_tokens").upsert({
+        await _execute(supabase.table("google_tokens").upsert({
             "user_id": current_user["id"],
             "access_token": body.access_token,
             "refresh_token": body.refresh_token,
             "expires_at": expires_at,
             "scope": body.scope
-        }).execute()
+        }))
+        _invalidate_google_credentials(current_user["id"])
         
         logger.info("Stored Google OAuth tokens", user_id=current_user["id"])
         
@@ -409,13 +672,14 @@ async def ingest_metadata(
 ):
     """Start metadata ingestion from Google Drive."""
     try:
-        # Create ingestion status record
+        # Create ingestion status record already marked as processing; the
+        # background task starts right away, so no separate update is needed
         ingestion_id = str(uuid.uuid4())
-        supabase.table("ingestion_status").insert({
+        await _execute(supabase.table("ingestion_status").insert({
             "id": ingestion_id,
             "user_id": current_user["id"],
-            "status": "pending"
-        }).execute()
+            "status": "processing"
+        }))
         
         # Start background task
         background_tasks.add_task(
@@ -428,7 +692,7 @@ async def ingest_metadata(
         
         return IngestResponse(
             task_id=ingestion_id,
-            status="pending",
+            status="processing",
             message="Metadata ingestion started"
         )
         
@@ -439,26 +703,21 @@ async def ingest_metadata(
 async def _ingest_metadata_task(user_id: str, task_id: str):
     """Background task for metadata ingestion."""
     try:
-        # Update status to processing
-        supabase.table("ingestion_status").update({
-            "status": "processing"
-        }).eq("id", task_id).execute()
-        
         # Get user's Google credentials from Supabase
         # Note: In a real implementation, you'd store and retrieve OAuth tokens
         # For now, we'll use environment variables for demo purposes
         user_credentials = {
-            "access_token": os.getenv("GOOGLE_ACCESS_TOKEN"),
-            "refresh_token": os.getenv("GOOGLE_REFRESH_TOKEN"),
-            "client_id": os.getenv("GOOGLE_CLIENT_ID"),
-            "client_secret": os.getenv("GOOGLE_CLIENT_SECRET")
+            "access_token": SETTINGS.google_access_token,
+            "refresh_token": SETTINGS.google_refresh_token,
+            "client_id": SETTINGS.google_client_id,
+            "client_secret": SETTINGS.google_client_secret
         }
         
         # Build Drive service
-        service = build_service(user_credentials)
+        service = await _run_drive(build_service, user_credentials)
         
         # List all files
-        files = list_files(service)
+        files = await _run_drive(list_files, service)
         
         # Generate snapshot ID
         snapshot_id = str(uuid.uuid4())
@@ -467,19 +726,19 @@ async def _ingest_metadata_task(user_id: str, task_id: str):
         chunk_size = 100
         for i in range(0, len(files), chunk_size):
             chunk = files[i:i + chunk_size]
-            supabase.table("metadata_raw").insert({
+            await _execute(supabase.table("metadata_raw").insert({
                 "user_id": user_id,
                 "snapshot_id": snapshot_id,
                 "file_metadata": chunk
-            }).execute()
+            }))
         
         # Update status to done
-        supabase.table("ingestion_status").update({
+        await _execute(supabase.table("ingestion_status").update({
             "status": "done",
             "total_files": len(files),
             "processed_files": len(files),
             "completed_at": "now()"
-        }).eq("id", task_id).execute()
+        }).eq("id", task_id))
         
         logger.info("Completed metadata ingestion", 
                    user_id=user_id, 
@@ -490,10 +749,10 @@ async def _ingest_metadata_task(user_id: str, task_id: str):
         logger.error("Failed to ingest metadata", error=str(e), task_id=task_id)
         
         # Update status to error
-        supabase.table("ingestion_status").update({
+        await _execute(supabase.table("ingestion_status").update({
             "status": "error",
             "error_message": str(e)
-        }).eq("id", task_id).execute()
+        }).eq("id", task_id))
 
 # Structure proposal endpoint
 @app.post("/propose", response_model=ProposeResponse)
@@ -504,9 +763,9 @@ async def propose_structure_endpoint(
     """Generate AI-powered folder structure proposal."""
     try:
         # Get metadata for the snapshot
-        metadata_response = supabase.table("metadata_raw").select("*").eq(
+        metadata_response = await _execute(supabase.table("metadata_raw").select("file_metadata").eq(
             "user_id", current_user["id"]
-        ).eq("snapshot_id", request.snapshot_id).execute()
+        ).eq("snapshot_id", request.snapshot_id))
         
         if not metadata_response.data:
             raise HTTPException(status_code=404, detail="No metadata found for snapshot")
@@ -517,9 +776,9 @@ async def propose_structure_endpoint(
             all_metadata.extend(record["file_metadata"])
         
         # Get user preferences
-        preferences_response = supabase.table("preferences").select("*").eq(
+        preferences_response = await _execute(supabase.table("preferences").select("*").eq(
             "user_id", current_user["id"]
-        ).execute()
+        ))
         
         user_preferences = preferences_response.data[0] if preferences_response.data else {}
         
@@ -532,13 +791,13 @@ async def propose_structure_endpoint(
         
         # Store proposal
         proposal_id = str(uuid.uuid4())
-        supabase.table("session_proposals").insert({
+        await _execute(supabase.table("session_proposals").insert({
             "id": proposal_id,
             "user_id": current_user["id"],
             "snapshot_id": request.snapshot_id,
             "proposal": proposal,
             "status": "draft"
-        }).execute()
+        }))
         
         logger.info("Generated structure proposal", 
                    user_id=current_user["id"], 
@@ -563,9 +822,9 @@ async def apply_structure(
     """Apply the proposed folder structure to Google Drive."""
     try:
         # Get the proposal
-        proposal_response = supabase.table("session_proposals").select("*").eq(
+        proposal_response = await _execute(supabase.table("session_proposals").select("proposal").eq(
             "id", request.proposal_id
-        ).eq("user_id", current_user["id"]).execute()
+        ).eq("user_id", current_user["id"]))
         
         if not proposal_response.data:
             raise HTTPException(status_code=404, detail="Proposal not found")
@@ -575,35 +834,49 @@ async def apply_structure(
         
         # Get user's Google credentials
         user_credentials = {
-            "access_token": os.getenv("GOOGLE_ACCESS_TOKEN"),
-            "refresh_token": os.getenv("GOOGLE_REFRESH_TOKEN"),
-            "client_id": os.getenv("GOOGLE_CLIENT_ID"),
-            "client_secret": os.getenv("GOOGLE_CLIENT_SECRET")
+            "access_token": SETTINGS.google_access_token,
+            "refresh_token": SETTINGS.google_refresh_token,
+            "client_id": SETTINGS.google_client_id,
+            "client_secret": SETTINGS.google_client_secret
         }
         
         # Build Drive service
-        service = build_service(user_credentials)
+        service = await _run_drive(build_service, user_credentials)
         
         # Track changes for undo
         changes = []
         
-        # Apply the structure
+        # Read every file's current parents up front in batch requests, so
+        # each move below is a single update
+        file_ids = []
+        pending_folders = list(proposal.get("root_folders", []))
+        while pending_folders:
+            folder = pending_folders.pop()
+            file_ids.extend(folder.get("files", []))
+            pending_folders.extend(folder.get("children", []))
+        current_parents = await _prefetch_parents(service, file_ids)
+        
+        # Apply the structure. Folder IDs are cached for the whole run so
+        # repeated names are only looked up once.
+        folder_cache = {}
         for folder in proposal.get("root_folders", []):
-            await _apply_folder_structure(service, folder, changes)
+            await _apply_folder_structure(service, folder, changes, folder_cache, current_parents)
         
         # Create undo log
         undo_log_id = str(uuid.uuid4())
-        supabase.table("undo_logs").insert({
+        await _execute(supabase.table("undo_logs").insert({
             "id": undo_log_id,
             "user_id": current_user["id"],
             "session_proposal_id": request.proposal_id,
             "changes": changes
-        }).execute()
+        }))
         
         # Update proposal status
-        supabase.table("session_proposals").update({
+        await _execute(supabase.table("session_proposals").update({
             "status": "applied"
-        }).eq("id", request.proposal_id).execute()
+        }).eq("id", request.proposal_id))
+        
+        _invalidate_drive_page_cache(current_user["id"])
         
         logger.info("Applied folder structure", 
                    user_id=current_user["id"], 
@@ -620,15 +893,45 @@ async def apply_structure(
         logger.error("Failed to apply structure", error=str(e))
         raise HTTPException(status_code=500, detail=f"Failed to apply structure: {str(e)}")
 
-async def _apply_folder_structure(service, folder: Dict, changes: List):
-    """Recursively apply folder structure."""
+async def _prefetch_parents(service, file_ids: List[str]) -> Dict:
+    """Read current parents in batch requests, or return {} if the batch fails.
+    
+    Moves without prefetched parents fall back to move_item's own lookup, so
+    a failed prefetch only costs the extra requests, never the moves.
+    """
+    try:
+        return await _run_drive(get_parents_batch, service, file_ids)
+    except DriveClientError as e:
+        logger.warning("Failed to prefetch parents", count=len(file_ids), error=str(e))
+        return {}
+
+async def _apply_folder_structure(
+    service,
+    folder: Dict,
+    changes: List,
+    folder_cache: Optional[Dict] = None,
+    current_parents: Optional[Dict] = None
+):
+    """Recursively apply folder structure.
+    
+    current_parents maps file IDs to their parent IDs (from get_parents_batch)
+    and is kept up to date as files move.
+    """
+    if current_parents is None:
+        current_parents = {}
+    
     # Create folder if it doesn't exist
-    folder_id = await _ensure_folder_exists(service, folder["name"])
+    folder_id = await _ensure_folder_exists(service, folder["name"], DRIVE_ROOT_ID, folder_cache)
     
     # Move files to this folder
     for file_id in folder.get("files", []):
         try:
-            move_item(service, file_id, folder_id)
+            parents = current_parents.get(file_id)
+            await _run_drive(
+                move_item, service, file_id, folder_id,
+                None if isinstance(parents, Exception) else parents
+            )
+            current_parents[file_id] = [folder_id]
             changes.append({
                 "type": "move",
                 "file_id": file_id,
@@ -636,18 +939,11 @@ async def _apply_folder_structure(service, folder: Dict, changes: List):
                 "folder_name": folder["name"]
             })
         except DriveClientError as e:
-            logger.warning(f"Failed to move file {file_id}: {str(e)}")
+            logger.warning("Failed to move file", file_id=file_id, error=str(e))
     
     # Process children
     for child in folder.get("children", []):
-        await _apply_folder_structure(service, child, changes)
-
-async def _ensure_folder_exists(service, folder_name: str) -> str:
-    """Ensure a folder exists and return its ID."""
-    # For demo purposes, we'll create a new folder
-    # In a real implementation, you'd check if it exists first
-    folder = create_folder(service, folder_name)
-    return folder["id"]
+        await _apply_folder_structure(service, child, changes, folder_cache, current_parents)
 
 # Undo endpoint
 @app.post("/undo/{log_id}", response_model=UndoResponse)
@@ -658,9 +954,9 @@ async def undo_changes(
     """Undo the changes made by a previous apply operation."""
     try:
         # Get the undo log
-        log_response = supabase.table("undo_logs").select("*").eq(
+        log_response = await _execute(supabase.table("undo_logs").select("reverted,changes,session_proposal_id").eq(
             "id", log_id
-        ).eq("user_id", current_user["id"]).execute()
+        ).eq("user_id", current_user["id"]))
         
         if not log_response.data:
             raise HTTPException(status_code=404, detail="Undo log not found")
@@ -672,36 +968,46 @@ async def undo_changes(
         
         # Get user's Google credentials
         user_credentials = {
-            "access_token": os.getenv("GOOGLE_ACCESS_TOKEN"),
-            "refresh_token": os.getenv("GOOGLE_REFRESH_TOKEN"),
-            "client_id": os.getenv("GOOGLE_CLIENT_ID"),
-            "client_secret": os.getenv("GOOGLE_CLIENT_SECRET")
+            "access_token": SETTINGS.google_access_token,
+            "refresh_token": SETTINGS.google_refresh_token,
+            "client_id": SETTINGS.google_client_id,
+            "client_secret": SETTINGS.google_client_secret
         }
         
         # Build Drive service
-        service = build_service(user_credentials)
+        service = await _run_drive(build_service, user_credentials)
         
-        # Reverse the changes
+        # Reverse the changes, reading current parents in batch requests first
         changes = log_data["changes"]
+        current_parents = await _prefetch_parents(
+            service, [change["file_id"] for change in changes if change["type"] == "move"]
+        )
         for change in reversed(changes):
             if change["type"] == "move":
                 try:
                     # Move file back to root (or original location)
-                    move_item(service, change["file_id"], "root")
+                    parents = current_parents.get(change["file_id"])
+                    await _run_drive(
+                        move_item, service, change["file_id"], "root",
+                        None if isinstance(parents, Exception) else parents
+                    )
+                    current_parents[change["file_id"]] = ["root"]
                 except DriveClientError as e:
-                    logger.warning(f"Failed to undo move for file {change['file_id']}: {str(e)}")
+                    logger.warning("Failed to undo move", file_id=change["file_id"], error=str(e))
+        
+        _invalidate_drive_page_cache(current_user["id"])
         
         # Mark as reverted
-        supabase.table("undo_logs").update({
+        await _execute(supabase.table("undo_logs").update({
             "reverted": True,
             "reverted_at": "now()"
-        }).eq("id", log_id).execute()
+        }).eq("id", log_id))
         
         # Update proposal status
         if log_data["session_proposal_id"]:
-            supabase.table("session_proposals").update({
+            await _execute(supabase.table("session_proposals").update({
                 "status": "reverted"
-            }).eq("id", log_data["session_proposal_id"]).execute()
+            }).eq("id", log_data["session_proposal_id"]))
         
         logger.info("Reverted changes", user_id=current_user["id"], log_id=log_id)
         
@@ -715,23 +1021,23 @@ async def undo_changes(
         raise HTTPException(status_code=500, detail=f"Failed to undo changes: {str(e)}")
 
 # Preferences endpoints
-@app.get("/preferences", response_model=PreferencesResponse)
+@app.get("/preferences", response_model=None)
 async def get_preferences(current_user: Dict = Depends(get_current_user)):
     """Get user preferences."""
     try:
-        response = supabase.table("preferences").select("*").eq(
+        response = await _execute(supabase.table("preferences").select("*").eq(
             "user_id", current_user["id"]
-        ).execute()
+        ))
         
         if response.data:
-            return PreferencesResponse(preferences=response.data[0])
+            return ORJSONResponse(content={"preferences": response.data[0]})
         else:
             # Return default preferences
-            return PreferencesResponse(preferences={
+            return ORJSONResponse(content={"preferences": {
                 "ignore_mime": [],
                 "ignore_large": False,
                 "max_file_size_mb": 100
-            })
+            }})
             
     except Exception as e:
         logger.error("Failed to get preferences", error=str(e))
@@ -752,7 +1058,7 @@ async def update_preferences(
         }
         
         # Upsert preferences
-        supabase.table("preferences").upsert(preferences_data).execute()
+        await _execute(supabase.table("preferences").upsert(preferences_data))
         
         logger.info("Updated preferences", user_id=current_user["id"])
         
@@ -763,45 +1069,75 @@ async def update_preferences(
         raise HTTPException(status_code=500, detail=f"Failed to update preferences: {str(e)}")
 
 # Status endpoints
-@app.get("/ingest/status/{task_id}")
+@app.get("/ingest/status/{task_id}", response_model=None)
 async def get_ingest_status(task_id: str, current_user: Dict = Depends(get_current_user)):
     """Get the status of a metadata ingestion task."""
     try:
-        response = supabase.table("ingestion_status").select("*").eq(
+        response = await _execute(supabase.table("ingestion_status").select("*").eq(
             "id", task_id
-        ).eq("user_id", current_user["id"]).execute()
+        ).eq("user_id", current_user["id"]))
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Task not found")
         
-        return response.data[0]
+        return ORJSONResponse(content=response.data[0])
         
     except Exception as e:
         logger.error("Failed to get ingest status", error=str(e))
         raise HTTPException(status_code=500, detail=f"Failed to get status: {str(e)}")
 
-@app.get("/proposals")
+@app.get("/proposals", response_model=None)
 async def get_proposals(current_user: Dict = Depends(get_current_user)):
     """Get all proposals for the current user."""
     try:
-        response = supabase.table("session_proposals").select("*").eq(
+        response = await _execute(supabase.table("session_proposals").select("*").eq(
             "user_id", current_user["id"]
-        ).order("created_at", desc=True).execute()
+        ).order("created_at", desc=True))
         
-        return {"proposals": response.data}
+        return ORJSONResponse(content={"proposals": response.data})
         
     except Exception as e:
         logger.error("Failed to get proposals", error=str(e))
         raise HTTPException(status_code=500, detail=f"Failed to get proposals: {str(e)}")
 
+def _drive_file_dict(file: Dict) -> Dict:
+    """Map a Drive API file resource to the DriveFile response shape."""
+    return {
+        "id": file.get("id", ""),
+        "name": file.get("name", ""),
+        "mime_type": file.get("mimeType", ""),
+        "size": int(file.get("size", 0)),
+        "created_time": file.get("createdTime", ""),
+        "modified_time": file.get("modifiedTime", ""),
+        "parents": file.get("parents", []),
+        "web_view_link": file.get("webViewLink", "")
+    }
+
+def _drive_folder_dict(folder: Dict) -> Dict:
+    """Map a Drive API folder resource to the DriveFolder response shape."""
+    return {
+        "id": folder.get("id", ""),
+        "name": folder.get("name", ""),
+        "created_time": folder.get("createdTime", ""),
+        "modified_time": folder.get("modifiedTime", ""),
+        "parents": folder.get("parents", []),
+        "web_view_link": folder.get("webViewLink", "")
+    }
+
 # Google Drive API endpoints
-@app.get("/api/drive/files", response_model=DriveFilesResponse)
+@app.get("/api/drive/files", response_model=None)
 async def get_drive_files(
     page_token: str = None,
     page_size: int = 50,
     current_user: Dict = Depends(get_current_user)
 ):
     """List user's Google Drive files with pagination."""
+    cache_key = (current_user["id"], page_token, page_size)
+    with _PAGE_CACHE_LOCK:
+        cached_page = _PAGE_CACHE.get(cache_key)
+    if cached_page is not None:
+        return Response(content=cached_page, media_type="application/json")
+    
     try:
         # Get user's Google OAuth tokens from database
         try:
@@ -814,41 +1150,39 @@ async def get_drive_files(
             )
         
         # Build Drive service
-        service = build_service(user_credentials)
+        service = await get_drive_service(current_user["id"], user_credentials)
         
         # List files with pagination
-        files_result = list_files(service, page_token=page_token, page_size=page_size)
-        
-        # Convert to Pydantic models
-        drive_files = []
-        files_list = files_result.get("files", [])
-        for file in files_list:
-            drive_files.append(DriveFile(
-                id=file.get("id", ""),
-                name=file.get("name", ""),
-                mime_type=file.get("mimeType", ""),
-                size=int(file.get("size", 0)),
-                created_time=file.get("createdTime", ""),
-                modified_time=file.get("modifiedTime", ""),
-                parents=file.get("parents", []),
-                web_view_link=file.get("webViewLink", "")
-            ))
+        files_result = await _run_drive(
+            list_files, service, page_token=page_token, page_size=page_size
+        )
+        
+        # Shape Drive items like DriveFile without building models
+        drive_files = [_drive_file_dict(file) for file in files_result.get("files", [])]
         
         logger.info("Retrieved Drive files", 
                    user_id=current_user["id"], 
                    file_count=len(drive_files))
         
-        return DriveFilesResponse(
-            files=drive_files,
-            next_page_token=files_result.get("nextPageToken"),
-            total_count=len(drive_files)
-        )
+        page = orjson.dumps({
+            "files": drive_files,
+            "next_page_token": files_result.get("nextPageToken"),
+            "total_count": len(drive_files)
+        })
+        with _PAGE_CACHE_LOCK:
+            _PAGE_CACHE[cache_key] = page
+        
+        return Response(content=page, media_type="application/json")
         
     except DriveClientError as e:
         logger.error("Drive API error", error=str(e))
+        if _is_unauthorized(e):
+            _invalidate_google_credentials(current_user["id"])
         raise HTTPException(status_code=400, detail=f"Drive API error: {str(e)}")
     except Exception as e:
         logger.error("Failed to get Drive files", error=str(e))
+        if _is_unauthorized(e):
+            _invalidate_google_credentials(current_user["id"])
         raise HTTPException(status_code=500, detail=f"Failed to get Drive files: {str(e)}")
 
 @app.get("/api/drive/folders", response_model=DriveFoldersResponse)
@@ -870,42 +1204,39 @@ async def get_drive_folders(
             )
         
         # Build Drive service
-        service = build_service(user_credentials)
-        
-        # List folders (folders are files with mimeType = 'application/vnd.google-apps.folder')
-        folders_result = list_files(service, 
-                                  page_token=page_token, 
-                                  page_size=page_size,
-                                  mime_type="application/vnd.google-apps.folder")
-        
-        # Convert to Pydantic models
-        drive_folders = []
-        folders_list = folders_result.get("files", [])
-        for folder in folders_list:
-            drive_folders.append(DriveFolder(
-                id=folder.get("id", ""),
-                name=folder.get("name", ""),
-                created_time=folder.get("createdTime", ""),
-                modified_time=folder.get("modifiedTime", ""),
-                parents=folder.get("parents", []),
-                web_view_link=folder.get("webViewLink", "")
-            ))
+        service = await get_drive_service(current_user["id"], user_credentials)
+        
+        # List folders (folders are files with mimeType = FOLDER_MIME_TYPE)
+        folders_result = await _run_drive(
+            list_files,
+            service,
+            page_token=page_token,
+            page_size=page_size,
+            mime_type=FOLDER_MIME_TYPE
+        )
+        
+        # Shape folders as plain dicts; orjson serializes them without model validation
+        drive_folders = [_drive_folder_dict(folder) for folder in folders_result.get("files", [])]
         
         logger.info("Retrieved Drive folders", 
                    user_id=current_user["id"], 
                    folder_count=len(drive_folders))
         
-        return DriveFoldersResponse(
-            folders=drive_folders,
-            next_page_token=folders_result.get("nextPageToken"),
-            total_count=len(drive_folders)
-        )
+        return ORJSONResponse(content={
+            "folders": drive_folders,
+            "next_page_token": folders_result.get("nextPageToken"),
+            "total_count": len(drive_folders)
+        })
         
     except DriveClientError as e:
         logger.error("Drive API error", error=str(e))
+        if _is_unauthorized(e):
+            _invalidate_google_credentials(current_user["id"])
         raise HTTPException(status_code=400, detail=f"Drive API error: {str(e)}")
     except Exception as e:
         logger.error("Failed to get Drive folders", error=str(e))
+        if _is_unauthorized(e):
+            _invalidate_google_credentials(current_user["id"])
         raise HTTPException(status_code=500, detail=f"Failed to get Drive folders: {str(e)}")
 
 @app.post("/api/drive/scan", response_model=DriveScanResponse)
@@ -919,14 +1250,14 @@ async def scan_drive(
     try:
         # Create scan record
         scan_id = str(uuid.uuid4())
-        supabase.table("drive_scans").insert({
+        await _execute(supabase.table("drive_scans").insert({
             "id": scan_id,
             "user_id": current_user["id"],
             "status": "pending",
             "include_folders": request.include_folders,
             "include_files": request.include_files,
             "max_results": request.max_results
-        }).execute()
+        }))
         
         # Start background scan task
         background_tasks.add_task(
@@ -954,6 +1285,100 @@ async def scan_drive(
         logger.error("Failed to start Drive scan", error=str(e))
         raise HTTPException(status_code=500, detail=f"Failed to start scan: {str(e)}")
 
+def _drive_file_row(scan_id: str, user_id: str, file: Dict) -> Dict:
+    """Map a Drive API file resource to a drive_files row."""
+    return {
+        "scan_id": scan_id,
+        "user_id": user_id,
+        "drive_id": file["id"],
+        "name": file.get("name", ""),
+        "mime_type": file.get("mimeType"),
+        "size": int(file["size"]) if "size" in file else None,
+        "parents": file.get("parents", []),
+        "created_time": file.get("createdTime"),
+        "modified_time": file.get("modifiedTime"),
+        "web_view_link": file.get("webViewLink")
+    }
+
+def _drive_folder_row(scan_id: str, user_id: str, folder: Dict) -> Dict:
+    """Map a Drive API folder resource to a drive_folders row."""
+    return {
+        "scan_id": scan_id,
+        "user_id": user_id,
+        "drive_id": folder["id"],
+        "name": folder.get("name", ""),
+        "parents": folder.get("parents", []),
+        "created_time": folder.get("createdTime"),
+        "modified_time": folder.get("modifiedTime"),
+        "web_view_link": folder.get("webViewLink")
+    }
+
+async def _insert_rows(table: str, rows: List[Dict], insert_slots: Optional[asyncio.Semaphore] = None):
+    """Insert rows in DB_INSERT_CHUNK_SIZE chunks, a few requests at a time.
+    
+    Callers issuing several batches can pass a shared semaphore so the
+    DB_INSERT_CONCURRENCY limit applies across all of them. Batches of at
+    least COPY_MIN_ROWS go through COPY when the Postgres pool is open.
+    """
+    insert_slots = insert_slots or asyncio.Semaphore(DB_INSERT_CONCURRENCY)
+    
+    if _pg_pool is not None and len(rows) >= COPY_MIN_ROWS:
+        async with insert_slots:
+            await _copy_rows(table, rows)
+        return
+    
+    async def insert_chunk(chunk: List[Dict]):
+        async with insert_slots:
+            await _execute(supabase.table(table).insert(chunk))
+    
+    await asyncio.gather(*[
+        insert_chunk(rows[i:i + DB_INSERT_CHUNK_SIZE])
+        for i in range(0, len(rows), DB_INSERT_CHUNK_SIZE)
+    ])
+
+async def _copy_rows(table: str, rows: List[Dict]):
+    """Write rows with a single COPY over the direct Postgres pool."""
+    columns = list(rows[0])
+    
+    # COPY takes native values; Drive timestamps arrive as ISO 8601 strings
+    def copy_value(column: str, value):
+        if value and column in ("created_time", "modified_time"):
+            return datetime.fromisoformat(value)
+        return value
+    
+    records = [tuple(copy_value(column, row[column]) for column in columns) for row in rows]
+    async with _pg_pool.acquire() as connection:
+        await connection.copy_records_to_table(table, records=records, columns=columns)
+
+def _fetch_scan_items(table: str, columns: str, scan_id: str, user_id: str) -> List[Dict]:
+    """Read back a scan's drive_files/drive_folders rows as Drive API items.
+    
+    PostgREST caps each response, so rows are fetched in DB_PAGE_SIZE ranges.
+    NULL columns are dropped so items look like the Drive API's output.
+    """
+    items = []
+    start = 0
+    while True:
+        response = supabase.table(table).select(columns).eq(
+            "scan_id", scan_id
+        ).eq("user_id", user_id).order("id").range(start, start + DB_PAGE_SIZE - 1).execute()
+        
+        items.extend(
+            {key: value for key, value in row.items() if value is not None}
+            for row in response.data
+        )
+        if len(response.data) < DB_PAGE_SIZE:
+            return items
+        start += DB_PAGE_SIZE
+
+async def _fetch_scan_contents(scan_id: str, user_id: str) -> Tuple[List[Dict], List[Dict]]:
+    """Fetch a scan's files and folders concurrently."""
+    files, folders = await asyncio.gather(
+        asyncio.to_thread(_fetch_scan_items, "drive_files", DRIVE_FILE_COLUMNS, scan_id, user_id),
+        asyncio.to_thread(_fetch_scan_items, "drive_folders", DRIVE_FOLDER_COLUMNS, scan_id, user_id)
+    )
+    return files, folders
+
 async def _scan_drive_task(
     user_id: str, 
     scan_id: str, 
@@ -964,9 +1389,9 @@ async def _scan_drive_task(
     """Background task for comprehensive Drive scanning."""
     try:
         # Update status to processing
-        supabase.table("drive_scans").update({
+        await _execute(supabase.table("drive_scans").update({
             "status": "processing"
-        }).eq("id", scan_id).execute()
+        }).eq("id", scan_id))
         
         # Get user's Google OAuth tokens from their Supabase session
         try:
@@ -976,50 +1401,65 @@ async def _scan_drive_task(
             raise Exception(f"Please sign in with Google to access Drive. Error: {str(e)}")
         
         # Build Drive service
-        service = build_service(user_credentials)
+        service = await get_drive_service(user_id, user_credentials)
+        
+        # Scanned items are kept to build the stored tree once the scan ends
+        scanned_files = []
+        scanned_folders = []
+        
+        # Write rows while later pages are still being fetched from Drive
+        flush_size = COPY_MIN_ROWS if _pg_pool is not None else DB_INSERT_CHUNK_SIZE
+        insert_slots = asyncio.Semaphore(DB_INSERT_CONCURRENCY)
+        pending_inserts = []
+        buffered_files = []
+        buffered_folders = []
         
-        all_files = []
-        all_folders = []
+        def flush(table: str, rows: List[Dict]):
+            pending_inserts.append(asyncio.create_task(_insert_rows(table, rows, insert_slots)))
         
-        # Recursively scan all items (files and folders)
-        if include_files or include_folders:
-            all_items = await _recursive_scan_drive(service, max_results=max_results)
+        try:
+            if include_files or include_folders:
+                async for page in _scan_drive_pages(service, max_results=max_results):
+                    # Separate files and folders
+                    for item in page:
+                        if item.get("mimeType") == FOLDER_MIME_TYPE:
+                            if include_folders:
+                                buffered_folders.append(_drive_folder_row(scan_id, user_id, item))
+                                scanned_folders.append(item)
+                        elif include_files:
+                            buffered_files.append(_drive_file_row(scan_id, user_id, item))
+                            scanned_files.append(item)
+                    
+                    if len(buffered_files) >= flush_size:
+                        flush("drive_files", buffered_files)
+                        buffered_files = []
+                    if len(buffered_folders) >= flush_size:
+                        flush("drive_folders", buffered_folders)
+                        buffered_folders = []
             
-            # Separate files and folders
-            for item in all_items:
-                if item.get("mimeType") == "application/vnd.google-apps.folder":
-                    if include_folders:
-                        all_folders.append(item)
-                else:
-                    if include_files:
-                        all_files.append(item)
-        
-        file_count = len(all_files)
-        folder_count = len(all_folders)
-        
-        # Store file metadata
-        if all_files:
-            supabase.table("drive_files").insert({
-                "scan_id": scan_id,
-                "user_id": user_id,
-                "files": all_files
-            }).execute()
+            # Store whatever is left, then wait for every write to land
+            flush("drive_files", buffered_files)
+            flush("drive_folders", buffered_folders)
+            await asyncio.gather(*pending_inserts)
+        except BaseException:
+            for task in pending_inserts:
+                task.cancel()
+            raise
         
-        # Store folder metadata
-        if all_folders:
-            supabase.table("drive_folders").insert({
-                "scan_id": scan_id,
-                "user_id": user_id,
-                "folders": all_folders
-            }).execute()
+        file_count = len(scanned_files)
+        folder_count = len(scanned_folders)
+        
+        # Completed scans never change, so the tree is built once and stored
+        tree_data = await asyncio.to_thread(build_tree_structure, scanned_files, scanned_folders)
         
         # Update scan status
-        supabase.table("drive_scans").update({
+        await _execute(supabase.table("drive_scans").update({
             "status": "completed",
             "file_count": file_count,
             "folder_count": folder_count,
+            "tree_data": tree_data,
             "completed_at": "now()"
-        }).eq("id", scan_id).execute()
+        }).eq("id", scan_id))
         
         logger.info("Completed Drive scan", 
                    user_id=user_id, 
@@ -1029,82 +1469,54 @@ async def _scan_drive_task(
         
     except Exception as e:
         logger.error("Failed to scan Drive", error=str(e), scan_id=scan_id)
+        if _is_unauthorized(e):
+            _invalidate_google_credentials(user_id)
         
         # Update status to error
-        supabase.table("drive_scans").update({
+        await _execute(supabase.table("drive_scans").update({
             "status": "error",
             "error_message": str(e)
-        }).eq("id", scan_id).execute()
+        }).eq("id", scan_id))
 
-async def _recursive_scan_drive(service, max_results: int = 1000, parent_id: str = None) -> List[Dict]:
-    """Recursively scan Google Drive to get all files and folders."""
-    all_items = []
+async def _scan_drive_pages(service, max_results: int = 1000) -> AsyncIterator[List[Dict]]:
+    """Scan Google Drive with one flat, paginated files.list walk.
+    
+    Every non-trashed item the user can see comes back in pages of 1000,
+    regardless of folder, so the walk costs ceil(N / 1000) calls instead of
+    one per folder. build_tree_structure rebuilds the hierarchy from parents.
+    Pages are yielded as they arrive so callers can store them while the
+    next one is fetched.
+    """
+    item_count = 0
+    page_token = None
     
     try:
-        # Build query for items in the current folder (or root if parent_id is None)
-        query = "trashed=false"
-        if parent_id:
-            query += f" and '{parent_id}' in parents"
-        else:
-            query += " and 'root' in parents"
-        
-        # Get items in current folder
-        results = service.files().list(
-            q=query,
-            pageSize=1000,
-            fields="nextPageToken, files(id, name, mimeType, parents, createdTime, modifiedTime, size, webViewLink)"
-        ).execute()
-        
-        items = results.get('files', [])
-        
-        for item in items:
-            all_items.append(item)
-            
-            # If this is a folder, recursively scan its contents
-            if item.get("mimeType") == "application/vnd.google-apps.folder":
-                logger.info(f"Scanning folder: {item.get('name', 'Unknown')} (ID: {item.get('id')})")
-                sub_items = await _recursive_scan_drive(service, max_results, item.get('id'))
-                all_items.extend(sub_items)
-            
-            # Check if we've reached the max results limit
-            if max_results and len(all_items) >= max_results:
-                all_items = all_items[:max_results]
-                break
-        
-        # Handle pagination
-        while 'nextPageToken' in results and (not max_results or len(all_items) < max_results):
-            results = service.files().list(
-                q=query,
+        while True:
+            request = service.files().list(
+                q="trashed=false",
                 pageSize=1000,
-                pageToken=results['nextPageToken'],
+                pageToken=page_token,
                 fields="nextPageToken, files(id, name, mimeType, parents, createdTime, modifiedTime, size, webViewLink)"
-            ).execute()
-            
-            items = results.get('files', [])
+            )
+            results = await _run_drive(execute_request, request)
+            page = results.get('files', [])
+            # Only the page that crosses the cap is trimmed, in place
+            if max_results and item_count + len(page) > max_results:
+                del page[max_results - item_count:]
             
-            for item in items:
-                all_items.append(item)
-                
-                # If this is a folder, recursively scan its contents
-                if item.get("mimeType") == "application/vnd.google-apps.folder":
-                    logger.info(f"Scanning folder: {item.get('name', 'Unknown')} (ID: {item.get('id')})")
-                    sub_items = await _recursive_scan_drive(service, max_results, item.get('id'))
-                    all_items.extend(sub_items)
-                
-                # Check if we've reached the max results limit
-                if max_results and len(all_items) >= max_results:
-                    all_items = all_items[:max_results]
-                    break
+            item_count += len(page)
+            yield page
             
-            if max_results and len(all_items) >= max_results:
+            page_token = results.get('nextPageToken')
+            if not page_token or (max_results and item_count >= max_results):
                 break
         
-        logger.info(f"Scanned {len(all_items)} items from folder {parent_id or 'root'}")
-        return all_items
+        logger.info("Scanned Drive", item_count=item_count)
         
     except Exception as e:
-        logger.error(f"Error scanning folder {parent_id or 'root'}", error=str(e))
-        return all_items
+        # A lost page would drop every page after it; fail the scan instead
+        logger.error("Error scanning Drive", error=str(e))
+        raise
 
 @app.get("/api/drive/scan/status/{scan_id}", response_model=DriveScanStatusResponse)
 async def get_drive_scan_status(
@@ -1113,9 +1525,9 @@ async def get_drive_scan_status(
 ):
     """Get the status of a Drive scan."""
     try:
-        response = supabase.table("drive_scans").select("*").eq(
+        response = await _execute(supabase.table("drive_scans").select("status,file_count,folder_count,error_message,completed_at").eq(
             "id", scan_id
-        ).eq("user_id", current_user["id"]).execute()
+        ).eq("user_id", current_user["id"]))
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Scan not found")
@@ -1136,91 +1548,98 @@ async def get_drive_scan_status(
         logger.error("Failed to get scan status", error=str(e))
         raise HTTPException(status_code=500, detail=f"Failed to get scan status: {str(e)}")
 
-def build_tree_structure(files: List[Dict], folders: List[Dict]) -> TreeNode:
-    """Build a tree structure from files and folders data."""
+def _root_tree_node(children: List[Dict]) -> Dict:
+    """Return the synthetic "My Drive" node that anchors the tree."""
+    return {
+        "id": "root",
+        "name": "My Drive",
+        "type": "folder",
+        "mime_type": None,
+        "size": None,
+        "created_time": None,
+        "modified_time": None,
+        "parents": [],
+        "web_view_link": "",
+        "children": children,
+        "level": 0
+    }
+
+def build_tree_structure(files: List[Dict], folders: List[Dict]) -> Dict:
+    """Build a tree structure from files and folders data.
+
+    Nodes are plain dicts shaped like TreeNode, so the tree can be serialized
+    in a single pass without recursive model validation. Items are linked by
+    list index and a node is only built once it is reached from the root.
+    """
     try:
-        # Create a map of all items by ID
-        items_map = {}
-        
-        # Add folders to the map
-        for folder in folders:
-            try:
-                items_map[folder["id"]] = {
-                    "id": folder["id"],
-                    "name": folder["name"],
-                    "type": "folder",
-                    "created_time": folder.get("createdTime", ""),
-                    "modified_time": folder.get("modifiedTime", ""),
-                    "parents": folder.get("parents", []),
-                    "web_view_link": folder.get("webViewLink", ""),
-                    "children": [],
-                    "level": 0
-                }
-            except KeyError as e:
-                logger.warning(f"Missing required field in folder: {e}", folder_id=folder.get("id"))
+        # Folders first, then files; items without an id or name are skipped
+        items = [item for item in folders if "id" in item and "name" in item]
+        folder_count = len(items)
+        items.extend(item for item in files if "id" in item and "name" in item)
+        skipped_count = len(folders) + len(files) - len(items)
+        
+        ids = [item["id"] for item in items]
+        id_to_idx = {item_id: i for i, item_id in enumerate(ids)}
+        parents_of = [item.get("parents", []) for item in items]
+        
+        # Bucket every item index under a single parent in one pass. Items with
+        # several parents are placed under the first one that was scanned, so
+        # each item appears once and the walk below cannot loop.
+        children_idx = defaultdict(list)
+        orphan_count = 0
+        
+        for i, parent_ids in enumerate(parents_of):
+            if id_to_idx[ids[i]] != i:
+                # A later item with the same id wins
                 continue
-        
-        # Add files to the map
-        for file in files:
-            try:
-                items_map[file["id"]] = {
-                    "id": file["id"],
-                    "name": file["name"],
-                    "type": "file",
-                    "mime_type": file.get("mimeType", ""),
-                    "size": file.get("size", 0),
-                    "created_time": file.get("createdTime", ""),
-                    "modified_time": file.get("modifiedTime", ""),
-                    "parents": file.get("parents", []),
-                    "web_view_link": file.get("webViewLink", ""),
-                    "children": [],
-                    "level": 0
-                }
-            except KeyError as e:
-                logger.warning(f"Missing required field in file: {e}", file_id=file.get("id"))
+            if not parent_ids or "root" in parent_ids:
+                children_idx["root"].append(i)
                 continue
-        
-        # Build the tree structure
-        root_items = []
-        
-        for item_id, item in items_map.items():
-            if not item["parents"] or "root" in item["parents"]:
-                # This is a root item
-                root_items.append(item)
+            parent_id = next((p for p in parent_ids if p in id_to_idx), None)
+            if parent_id is None:
+                # Parent not found, treat as root item
+                children_idx["root"].append(i)
+                orphan_count += 1
             else:
-                # This item has parents, add it to the appropriate parent
-                for parent_id in item["parents"]:
-                    if parent_id in items_map:
-                        parent = items_map[parent_id]
-                        parent["children"].append(item)
-                        item["level"] = parent["level"] + 1
-                    else:
-                        # Parent not found, treat as root item
-                        logger.warning(f"Parent {parent_id} not found for item {item_id}, treating as root")
-                        root_items.append(item)
-                        break
-        
-        # Create the root node
-        root_node = TreeNode(
-            id="root",
-            name="My Drive",
-            type="folder",
-            children=root_items,
-            level=0
-        )
+                children_idx[parent_id].append(i)
+        
+        if skipped_count or orphan_count:
+            logger.warning("Some items could not be linked into the tree",
+                           skipped_count=skipped_count,
+                           orphan_count=orphan_count)
+        
+        # Walk down from the root, building nodes and assigning levels
+        root_node = _root_tree_node([])
+        stack = [(i, 0, root_node["children"]) for i in reversed(children_idx["root"])]
+        while stack:
+            i, level, siblings = stack.pop()
+            item = items[i]
+            is_folder = i < folder_count
+            node = {
+                "id": item["id"],
+                "name": item["name"],
+                "type": "folder" if is_folder else "file",
+                "mime_type": None if is_folder else item.get("mimeType", ""),
+                "size": None if is_folder else int(item.get("size", 0)),
+                "created_time": item.get("createdTime", ""),
+                "modified_time": item.get("modifiedTime", ""),
+                "parents": parents_of[i],
+                "web_view_link": item.get("webViewLink", ""),
+                "children": [],
+                "level": level
+            }
+            siblings.append(node)
+            child_idxs = children_idx.get(ids[i])
+            if child_idxs:
+                grandchildren = node["children"]
+                stack.extend([(child, level + 1, grandchildren) for child in reversed(child_idxs)])
         
         return root_node
         
     except Exception as e:
         logger.error("Failed to build tree structure", error=str(e))
         # Return a minimal root node if tree building fails
-        return TreeNode(
-            id="root",
-            name="My Drive",
-            type="folder",
-            children=[],
-            level=0
-        )
+        return _root_tree_node([])
 
 @app.get("/api/drive/scan-results/latest", response_model=ScanResultsResponse)
 async def get_latest_scan_results(
@@ -1229,9 +1648,11 @@ async def get_latest_scan_results(
     """Get the latest completed scan results for the current user."""
     try:
         # Get the latest completed scan
-        scan_response = supabase.table("drive_scans").select("*").eq(
-            "user_id", current_user["id"]
-        ).eq("status", "completed").order("completed_at", desc=True).limit(1).execute()
+        scan_response = await _execute(
+            supabase.table("drive_scans").select("id,status,file_count,folder_count,started_at,completed_at,tree_data").eq(
+                "user_id", current_user["id"]
+            ).eq("status", "completed").order("completed_at", desc=True).limit(1)
+        )
         
         if not scan_response.data:
             raise HTTPException(
@@ -1242,41 +1663,24 @@ async def get_latest_scan_results(
         scan_data = scan_response.data[0]
         scan_id = scan_data["id"]
         
-        # Get files data
-        files_response = supabase.table("drive_files").select("files").eq(
-            "scan_id", scan_id
-        ).eq("user_id", current_user["id"]).execute()
-        
-        files = []
-        if files_response.data:
-            files = files_response.data[0]["files"]
-        
-        # Get folders data
-        folders_response = supabase.table("drive_folders").select("folders").eq(
-            "scan_id", scan_id
-        ).eq("user_id", current_user["id"]).execute()
-        
-        folders = []
-        if folders_response.data:
-            folders = folders_response.data[0]["folders"]
+        # Get files and folders data
+        files, folders = await _fetch_scan_contents(scan_id, current_user["id"])
         
-        # Build tree structure
-        tree_data = build_tree_structure(files, folders)
+        # Use the tree stored at scan time; older scans predate the column
+        tree_data = scan_data.get("tree_data") or build_tree_structure(files, folders)
         
-        # Convert to Pydantic models for response
-        drive_files = [DriveFile(**file) for file in files]
-        drive_folders = [DriveFolder(**folder) for folder in folders]
-        
-        return ScanResultsResponse(
-            scan_id=scan_id,
-            status=scan_data["status"],
-            file_count=scan_data.get("file_count", 0),
-            folder_count=scan_data.get("folder_count", 0),
-            scan_timestamp=scan_data.get("completed_at", scan_data.get("started_at")),
-            tree_data=tree_data,
-            files=drive_files,
-            folders=drive_folders
-        )
+        # Serialize once with orjson; every part is already in response shape,
+        # so nothing is re-validated through the Pydantic models
+        return ORJSONResponse(content={
+            "scan_id": scan_id,
+            "status": scan_data["status"],
+            "file_count": scan_data.get("file_count", 0),
+            "folder_count": scan_data.get("folder_count", 0),
+            "scan_timestamp": scan_data.get("completed_at", scan_data.get("started_at")),
+            "tree_data": tree_data,
+            "files": [_drive_file_dict(file) for file in files],
+            "folders": [_drive_folder_dict(folder) for folder in folders]
+        })
         
     except HTTPException:
         raise
@@ -1291,58 +1695,50 @@ async def get_scan_results(
 ):
     """Get the complete scan results with tree structure for a specific scan."""
     try:
-        # Get scan metadata
-        scan_response = supabase.table("drive_scans").select("*").eq(
-            "id", scan_id
-        ).eq("user_id", current_user["id"]).execute()
-        
-        if not scan_response.data:
-            raise HTTPException(status_code=404, detail="Scan not found")
-        
-        scan_data = scan_response.data[0]
+        # Start fetching files and folders while the scan metadata is checked
+        contents_task = asyncio.create_task(_fetch_scan_contents(scan_id, current_user["id"]))
         
-        # Check if scan is completed
-        if scan_data["status"] != "completed":
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Scan is not completed. Current status: {scan_data['status']}"
+        try:
+            # Get scan metadata
+            scan_response = await _execute(
+                supabase.table("drive_scans").select("status,file_count,folder_count,started_at,completed_at,tree_data").eq(
+                    "id", scan_id
+                ).eq("user_id", current_user["id"])
             )
+            
+            if not scan_response.data:
+                raise HTTPException(status_code=404, detail="Scan not found")
+            
+            scan_data = scan_response.data[0]
+            
+            # Check if scan is completed
+            if scan_data["status"] != "completed":
+                raise HTTPException(
+                    status_code=400, 
+                    detail=f"Scan is not completed. Current status: {scan_data['status']}"
+                )
+        except BaseException:
+            contents_task.cancel()
+            raise
         
-        # Get files data
-        files_response = supabase.table("drive_files").select("files").eq(
-            "scan_id", scan_id
-        ).eq("user_id", current_user["id"]).execute()
-        
-        files = []
-        if files_response.data:
-            files = files_response.data[0]["files"]
-        
-        # Get folders data
-        folders_response = supabase.table("drive_folders").select("folders").eq(
-            "scan_id", scan_id
-        ).eq("user_id", current_user["id"]).execute()
-        
-        folders = []
-        if folders_response.data:
-            folders = folders_response.data[0]["folders"]
-        
-        # Build tree structure
-        tree_data = build_tree_structure(files, folders)
+        # Get files and folders data
+        files, folders = await contents_task
         
-        # Convert to Pydantic models for response
-        drive_files = [DriveFile(**file) for file in files]
-        drive_folders = [DriveFolder(**folder) for folder in folders]
+        # Use the tree stored at scan time; older scans predate the column
+        tree_data = scan_data.get("tree_data") or build_tree_structure(files, folders)
         
-        return ScanResultsResponse(
-            scan_id=scan_id,
-            status=scan_data["status"],
-            file_count=scan_data.get("file_count", 0),
-            folder_count=scan_data.get("folder_count", 0),
-            scan_timestamp=scan_data.get("completed_at", scan_data.get("started_at")),
-            tree_data=tree_data,
-            files=drive_files,
-            folders=drive_folders
-        )
+        # Serialize once with orjson; every part is already in response shape,
+        # so nothing is re-validated through the Pydantic models
+        return ORJSONResponse(content={
+            "scan_id": scan_id,
+            "status": scan_data["status"],
+            "file_count": scan_data.get("file_count", 0),
+            "folder_count": scan_data.get("folder_count", 0),
+            "scan_timestamp": scan_data.get("completed_at", scan_data.get("started_at")),
+            "tree_data": tree_data,
+            "files": [_drive_file_dict(file) for file in files],
+            "folders": [_drive_folder_dict(folder) for folder in folders]
+        })
         
     except HTTPException:
         raise
@@ -1356,7 +1752,7 @@ try:
     ai_service = AIService()
     logger.info("✅ AI service initialized successfully")
 except Exception as e:
-    logger.error(f"❌ Failed to initialize AI service: {e}")
+    logger.error("❌ Failed to initialize AI service", error=str(e))
     ai_service = None
 
 @app.post("/api/ai/analyze/{scan_id}", response_model=AIAnalysisResponse)
@@ -1370,51 +1766,48 @@ async def analyze_drive_with_ai(
         if not ai_service:
             raise HTTPException(status_code=500, detail="AI service not available")
         
-        # Check if analysis already exists for this scan
-        existing_response = supabase.table("ai_analyses").select("id, status").eq(
-            "scan_id", scan_id
-        ).eq("user_id", current_user["id"]).execute()
+        # Claim the analysis atomically: only the request that creates the row,
+        # or moves a failed one back to processing, starts the background task.
+        # Duplicate clicks fall through to reporting the existing analysis.
+        claim_response = await _execute(supabase.table("ai_analyses").upsert({
+            "id": str(uuid.uuid4()),
+            "scan_id": scan_id,
+            "user_id": current_user["id"],
+            "status": "processing",
+            "progress": 0
+        }, on_conflict="scan_id,user_id", ignore_duplicates=True))
         
-        if existing_response.data:
+        if not claim_response.data:
+            # Restart a failed analysis, unless another request already has
+            claim_response = await _execute(supabase.table("ai_analyses").update({
+                "status": "processing",
+                "progress": 0,
+                "error_message": None,
+                "completed_at": None
+            }).eq("scan_id", scan_id).eq("user_id", current_user["id"]).neq(
+                "status", "completed"
+            ).neq("status", "processing"))
+        
+        if not claim_response.data:
+            existing_response = await _execute(supabase.table("ai_analyses").select("id,status").eq(
+                "scan_id", scan_id
+            ).eq("user_id", current_user["id"]))
             existing_analysis = existing_response.data[0]
-            analysis_id = existing_analysis["id"]
             
-            # If analysis is already completed, return it
             if existing_analysis["status"] == "completed":
                 return AIAnalysisResponse(
-                    analysis_id=analysis_id,
+                    analysis_id=existing_analysis["id"],
                     status="completed",
                     message="Analysis already completed"
                 )
             
-            # If analysis is in progress, return it
-            if existing_analysis["status"] == "processing":
-                return AIAnalysisResponse(
-                    analysis_id=analysis_id,
-                    status="processing",
-                    message="Analysis already in progress"
-                )
-            
-            # If analysis failed, we can restart it
-            # Update the existing record
-            supabase.table("ai_analyses").update({
-                "status": "processing",
-                "progress": 0,
-                "error_message": None,
-                "completed_at": None
-            }).eq("id", analysis_id).execute()
-        else:
-            # Generate new analysis ID
-            analysis_id = str(uuid.uuid4())
-            
-            # Store analysis status
-            supabase.table("ai_analyses").insert({
-                "id": analysis_id,
-                "scan_id": scan_id,
-                "user_id": current_user["id"],
-                "status": "processing",
-                "created_at": "now()"
-            }).execute()
+            return AIAnalysisResponse(
+                analysis_id=existing_analysis["id"],
+                status="processing",
+                message="Analysis already in progress"
+            )
+        
+        analysis_id = claim_response.data[0]["id"]
         
         # Start background task
         background_tasks.add_task(
@@ -1441,9 +1834,9 @@ async def get_ai_analysis_status(
 ):
     """Get AI analysis status"""
     try:
-        response = supabase.table("ai_analyses").select("*").eq(
+        response = await _execute(supabase.table("ai_analyses").select("status,progress,error_message,completed_at").eq(
             "id", analysis_id
-        ).eq("user_id", current_user["id"]).execute()
+        ).eq("user_id", current_user["id"]))
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Analysis not found")
@@ -1462,17 +1855,31 @@ async def get_ai_analysis_status(
         logger.error("Failed to get analysis status", error=str(e))
         raise HTTPException(status_code=500, detail=f"Failed to get status: {str(e)}")
 
-@app.get("/api/ai/proposal/{analysis_id}")
+def _proposal_response(body: bytes, etag: str, if_none_match: Optional[str]) -> Response:
+    """Return the proposal body, or 304 when the client already has it."""
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=3600"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@app.get("/api/ai/proposal/{analysis_id}", response_model=None)
 async def get_ai_proposal(
     analysis_id: str,
-    current_user: Dict = Depends(get_current_user)
+    current_user: Dict = Depends(get_current_user),
+    if_none_match: Optional[str] = Header(None)
 ):
     """Get AI-generated organization proposal"""
+    cache_key = (analysis_id, current_user["id"])
+    with _PROPOSAL_CACHE_LOCK:
+        cached = _PROPOSAL_CACHE.get(cache_key)
+    if cached is not None:
+        return _proposal_response(*cached, if_none_match)
+    
     try:
         # Get analysis data
-        response = supabase.table("ai_analyses").select("*").eq(
+        response = await _execute(supabase.table("ai_analyses").select("status").eq(
             "id", analysis_id
-        ).eq("user_id", current_user["id"]).execute()
+        ).eq("user_id", current_user["id"]))
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Analysis not found")
@@ -1483,15 +1890,24 @@ async def get_ai_proposal(
             raise HTTPException(status_code=400, detail="Analysis not completed")
         
         # Get proposal data
-        proposal_response = supabase.table("ai_proposals").select("*").eq(
+        proposal_response = await _execute(supabase.table("ai_proposals").select("proposal_data").eq(
             "analysis_id", analysis_id
-        ).execute()
+        ))
         
         if not proposal_response.data:
             raise HTTPException(status_code=404, detail="Proposal not found")
         
-        return proposal_response.data[0]["proposal_data"]
+        # Proposals list every move, so skip jsonable_encoder and dump directly;
+        # sorted keys keep the ETag stable across workers
+        body = orjson.dumps(proposal_response.data[0]["proposal_data"], option=orjson.OPT_SORT_KEYS)
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        with _PROPOSAL_CACHE_LOCK:
+            _PROPOSAL_CACHE[cache_key] = (body, etag)
+        
+        return _proposal_response(body, etag, if_none_match)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Failed to get AI proposal", error=str(e))
         raise HTTPException(status_code=500, detail=f"Failed to get proposal: {str(e)}")
@@ -1504,21 +1920,30 @@ async def apply_ai_proposal(
     """Apply AI proposal to Google Drive"""
     try:
         # Get proposal
-        proposal_response = supabase.table("ai_proposals").select("*").eq(
+        proposal_response = await _execute(supabase.table("ai_proposals").select("proposal_data").eq(
             "analysis_id", analysis_id
-        ).execute()
+        ))
         
         if not proposal_response.data:
             raise HTTPException(status_code=404, detail="Proposal not found")
         
         proposal_data = proposal_response.data[0]["proposal_data"]
         
-        # Get Google Drive service
-        user_credentials = await get_google_oauth_tokens(current_user["id"])
-        service = build_service(user_credentials)
-        
-        # Apply changes
-        results = await _apply_ai_proposal(service, proposal_data)
+        if not proposal_data.get("proposed_folders") and not proposal_data.get("file_moves"):
+            # Nothing to apply; skip loading Google credentials and Drive
+            results = {
+                "successful_moves": [],
+                "failed_moves": [],
+                "created_folders": []
+            }
+        else:
+            # Get Google Drive service
+            user_credentials = await get_google_oauth_tokens(current_user["id"])
+            service = await get_drive_service(current_user["id"], user_credentials)
+            
+            # Apply changes
+            results = await _apply_ai_proposal(service, proposal_data, current_user["id"])
+            _invalidate_drive_page_cache(current_user["id"])
         
         return {
             "success": True,
@@ -1528,80 +1953,77 @@ async def apply_ai_proposal(
         
     except Exception as e:
         logger.error("Failed to apply AI proposal", error=str(e))
+        if _is_unauthorized(e):
+            _invalidate_google_credentials(current_user["id"])
         raise HTTPException(status_code=500, detail=str(e))
 
 async def _ai_analysis_task(analysis_id: str, scan_id: str, user_id: str):
     """Background task for AI analysis"""
     try:
         # Update status to processing
-        supabase.table("ai_analyses").update({
+        await _execute(supabase.table("ai_analyses").update({
             "status": "processing",
             "progress": 10
-        }).eq("id", analysis_id).execute()
+        }).eq("id", analysis_id))
+        progress_written_at = time.monotonic()
         
-        # Get scan data
-        scan_response = supabase.table("drive_scans").select("*").eq(
-            "id", scan_id
-        ).eq("user_id", user_id).execute()
+        async def report_progress(progress: int) -> None:
+            nonlocal progress_written_at
+            if time.monotonic() - progress_written_at < AI_PROGRESS_UPDATE_INTERVAL:
+                return
+            await _execute(supabase.table("ai_analyses").update({
+                "progress": progress
+            }).eq("id", analysis_id))
+            progress_written_at = time.monotonic()
         
-        if not scan_response.data:
-            raise Exception("Scan not found")
+        # Get scan data, fetching files and folders alongside it
+        contents_task = asyncio.create_task(_fetch_scan_contents(scan_id, user_id))
         
-        scan_data = scan_response.data[0]
+        try:
+            scan_response = await _execute(
+                supabase.table("drive_scans").select("id").eq(
+                    "id", scan_id
+                ).eq("user_id", user_id)
+            )
+            
+            if not scan_response.data:
+                raise Exception("Scan not found")
+        except BaseException:
+            contents_task.cancel()
+            raise
         
         # Get files and folders
-        files_response = supabase.table("drive_files").select("*").eq(
-            "scan_id", scan_id
-        ).execute()
-        
-        folders_response = supabase.table("drive_folders").select("*").eq(
-            "scan_id", scan_id
-        ).execute()
-        
-        files = files_response.data[0]["files"] if files_response.data else []
-        folders = folders_response.data[0]["folders"] if folders_response.data else []
+        files, folders = await contents_task
         
         # Update progress
-        supabase.table("ai_analyses").update({
-            "progress": 30
-        }).eq("id", analysis_id).execute()
+        await report_progress(30)
         
         # Generate AI proposal
         proposal = await ai_service.generate_proposal(scan_id, files, folders)
         
         # Update progress
-        supabase.table("ai_analyses").update({
-            "progress": 80
-        }).eq("id", analysis_id).execute()
+        await report_progress(80)
         
-        # Store proposal
-        supabase.table("ai_proposals").insert({
-            "analysis_id": analysis_id,
-            "scan_id": scan_id,
-            "user_id": user_id,
-            "proposal_data": proposal,
-            "created_at": "now()"
-        }).execute()
-        
-        # Update status to completed
-        supabase.table("ai_analyses").update({
-            "status": "completed",
-            "progress": 100,
-            "completed_at": "now()"
-        }).eq("id", analysis_id).execute()
+        # Store proposal and mark the analysis completed in one transaction
+        await _execute(supabase.rpc("finalize_ai_analysis", {
+            "p_analysis_id": analysis_id,
+            "p_scan_id": scan_id,
+            "p_user_id": user_id,
+            "p_proposal": proposal
+        }))
         
-        logger.info(f"AI analysis completed for {analysis_id}")
+        logger.info("AI analysis completed", analysis_id=analysis_id)
         
     except Exception as e:
-        logger.error(f"AI analysis failed for {analysis_id}: {str(e)}")
+        logger.error("AI analysis failed", analysis_id=analysis_id, error=str(e))
         
         # Update status to error
-        supabase.table("ai_analyses").update({
+        await _execute(supabase.table("ai_analyses").update({
             "status": "error",
             "error_message": str(e)
-        }).eq("id", analysis_id).execute()
+        }).eq("id", analysis_id))
 
-async def _apply_ai_proposal(service, proposal_data: Dict) -> Dict:
+async def _apply_ai_proposal(service, proposal_data: Dict, user_id: str) -> Dict:
     """Apply AI proposal to Google Drive"""
     results = {
         "successful_moves": [],
@@ -1610,70 +2032,154 @@ async def _apply_ai_proposal(service, proposal_data: Dict) -> Dict:
     }
     
     try:
-        # Create folders and track their IDs
+        # Look up and create folders in batch requests, one chunk of names per
+        # worker thread. Names are deduplicated first so two lookups for the
+        # same name can't both create it.
+        folder_slots = asyncio.Semaphore(SETTINGS.drive_folder_concurrency)
+        folder_names = list(dict.fromkeys(folder["name"] for folder in proposal_data["proposed_folders"]))
+        name_chunks = [
+            folder_names[start:start + BATCH_REQUEST_LIMIT]
+            for start in range(0, len(folder_names), BATCH_REQUEST_LIMIT)
+        ]
+        
+        async def ensure_folders(names: List[str]) -> Dict[str, str]:
+            async with folder_slots:
+                return await _run_drive(_ensure_folders_batch, service, names, DRIVE_ROOT_ID)
+        
+        chunk_results = await asyncio.gather(
+            *[ensure_folders(names) for names in name_chunks],
+            return_exceptions=True
+        )
+        
         folder_map = {}
-        for folder in proposal_data["proposed_folders"]:
-            try:
-                folder_id = await _ensure_folder_exists(service, folder["name"])
-                folder_map[folder["name"]] = folder_id
+        for names, chunk_folders in zip(name_chunks, chunk_results):
+            if isinstance(chunk_folders, Exception):
+                logger.error("Failed to create folders", folder_names=names, error=str(chunk_folders))
+                if _is_unauthorized(chunk_folders):
+                    _invalidate_google_credentials(user_id)
+                continue
+            for folder_name in names:
+                folder_id = chunk_folders.get(folder_name)
+                if folder_id is None:
+                    logger.error("Failed to create folder", folder_name=folder_name)
+                    continue
+                folder_map[folder_name] = folder_id
                 results["created_folders"].append({
-                    "name": folder["name"],
+                    "name": folder_name,
                     "id": folder_id
                 })
-            except Exception as e:
-                logger.error(f"Failed to create folder {folder['name']}: {str(e)}")
         
-        # Move files
-        for move in proposal_data["file_moves"]:
+        # Move files in batch requests, a few chunks at a time; each move
+        # succeeds or fails on its own
+        move_slots = asyncio.Semaphore(SETTINGS.drive_move_concurrency)
+        file_moves = proposal_data["file_moves"]
+        move_errors: List[Optional[str]] = [None] * len(file_moves)
+        
+        batched = []
+        for index, move in enumerate(file_moves):
+            proposed_folder = move["proposed_folder"]
+            target_folder_id = folder_map.get(proposed_folder)
+            if not target_folder_id:
+                move_errors[index] = f"Target folder '{proposed_folder}' not found"
+                continue
+            batched.append((index, move["file_id"], target_folder_id))
+        
+        async def move_chunk(chunk: List[Tuple[int, str, str]]):
             try:
-                target_folder_id = folder_map.get(move["proposed_folder"])
-                if target_folder_id:
-                    await move_item(service, move["file_id"], target_folder_id)
-                    results["successful_moves"].append(move["file_id"])
-                else:
-                    results["failed_moves"].append({
-                        "file_id": move["file_id"],
-                        "error": f"Target folder '{move['proposed_folder']}' not found"
-                    })
+                async with move_slots:
+                    errors = await _run_drive(
+                        move_items_batch, service, [(file_id, folder_id) for _, file_id, folder_id in chunk]
+                    )
             except Exception as e:
-                results["failed_moves"].append({
-                    "file_id": move["file_id"],
-                    "error": str(e)
+                errors = [str(e)] * len(chunk)
+            for (index, _, _), error in zip(chunk, errors):
+                move_errors[index] = error
+        
+        await asyncio.gather(*[
+            move_chunk(batched[start:start + BATCH_REQUEST_LIMIT])
+            for start in range(0, len(batched), BATCH_REQUEST_LIMIT)
+        ])
+        # Failed moves are only reported, so a revoked grant is caught here
+        if any(error and _is_unauthorized(error) for error in move_errors):
+            _invalidate_google_credentials(user_id)
+        
+        successful_moves = results["successful_moves"]
+        failed_moves = results["failed_moves"]
+        for move, error in zip(file_moves, move_errors):
+            file_id = move["file_id"]
+            if error is None:
+                successful_moves.append(file_id)
+            else:
+                failed_moves.append({
+                    "file_id": file_id,
+                    "error": error
                 })
         
         return results
         
     except Exception as e:
-        logger.error(f"Failed to apply AI proposal: {str(e)}")
+        logger.error("Failed to apply AI proposal", error=str(e))
         raise e
 
-async def _ensure_folder_exists(service, folder_name: str, parent_id: str = None) -> str:
-    """Ensure folder exists, create if it doesn't"""
+def _ensure_folders_batch(service, folder_names: List[str], parent_id: str = None) -> Dict[str, str]:
+    """Find existing folders and create the missing ones, one batch request each"""
+    existing = find_folders_batch(service, folder_names, parent_id)
+    missing = [name for name in folder_names if name in existing and existing[name] is None]
+    created = create_folders_batch(service, missing, parent_id) if missing else {}
+    folders = {name: folder_id for name, folder_id in existing.items() if folder_id}
+    folders.update(created)
+    return folders
+
+async def _ensure_folder_exists(
+    service,
+    folder_name: str,
+    parent_id: str = None,
+    folder_cache: Optional[Dict[Tuple[Optional[str], str], str]] = None
+) -> str:
+    """Ensure folder exists, create if it doesn't.
+    
+    folder_cache maps (parent_id, folder_name) to folder IDs already resolved
+    in this run; hits skip the Drive lookup entirely.
+    """
+    cache_key = (parent_id, folder_name)
+    if folder_cache is not None and cache_key in folder_cache:
+        return folder_cache[cache_key]
+    
     try:
         # Try to find existing folder
-        query = f"name='{folder_name}' and mimeType='application/vnd.google-apps.folder' and trashed=false"
+        query = f"name='{escape_query_value(folder_name)}' and mimeType='{FOLDER_MIME_TYPE}' and trashed=false"
         if parent_id:
             query += f" and '{parent_id}' in parents"
         
-        results = service.files().list(q=query, fields="files(id,name)").execute()
+        results = await _run_drive(
+            execute_request, service.files().list(
+                q=query, fields="files(id)", pageSize=1, spaces="drive", corpora="user"
+            )
+        )
         files = results.get('files', [])
         
         if files:
+            if folder_cache is not None:
+                folder_cache[cache_key] = files[0]['id']
             return files[0]['id']
         
         # Create new folder
         folder_metadata = {
             'name': folder_name,
-            'mimeType': 'application/vnd.google-apps.folder'
+            'mimeType': FOLDER_MIME_TYPE
         }
         if parent_id:
             folder_metadata['parents'] = [parent_id]
         
-        folder = service.files().create(body=folder_metadata, fields='id').execute()
+        folder = await _run_drive(
+            execute_request, service.files().create(body=folder_metadata, fields='id')
+        )
+        if folder_cache is not None:
+            folder_cache[cache_key] = folder['id']
         return folder['id']
         
     except Exception as e:
-        logger.error(f"Failed to ensure folder exists: {str(e)}")
+        logger.error("Failed to ensure folder exists", folder_name=folder_name, error=str(e))
         raise e
 
 if __name__ == "__main__":
@@ -1685,6 +2191,8 @@ if __name__ == "__main__":
     host = os.getenv("HOST", "0.0.0.0")
     
     print(f"Starting Drive Organizer API on {host}:{port}")
-    print(f"PORT environment variable: {os.getenv('PORT', 'not set')}")
-    print(f"All environment variables: {dict(os.environ)}")
-    uvicorn.run(app, host=host, port=port) 
\ No newline at end of file
+    # The full environment includes secrets; only dump it when debugging startup
+    if os.getenv("DEBUG_ENV") == "1":
+        print(f"PORT environment variable: {os.getenv('PORT', 'not set')}")
+        print(f"All environment variables: {dict(os.environ)}")
+    uvicorn.run(app, host=host, port=port, loop=UVICORN_LOOP) 
\ No newline at end of file
@@ -25,7 +25,7 @@ for env_file in env_files:
         break
 
 # Import and run the FastAPI app
-from main import app
+from main import app, UVICORN_LOOP
 
 if __name__ == "__main__":
     import uvicorn
@@ -35,6 +35,8 @@ if __name__ == "__main__":
     host = os.getenv("HOST", "0.0.0.0")
     
     print(f"Starting Drive Organizer API on {host}:{port}")
-    print(f"PORT environment variable: {os.getenv('PORT', 'not set')}")
-    print(f"All environment variables: {dict(os.environ)}")
-    uvicorn.run(app, host=host, port=port) 
\ No newline at end of file
+    # The full environment includes secrets; only dump it when debugging startup
+    if os.getenv("DEBUG_ENV") == "1":
+        print(f"PORT environment variable: {os.getenv('PORT', 'not set')}")
+        print(f"All environment variables: {dict(os.environ)}")
+    uvicorn.run(app, host=host, port=port, loop=UVICORN_LOOP) 
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""Unit tests for AI service module."""
+
+import json
+import os
+import pytest
+from unittest.mock import patch
+from ai_service import AIService
+
+
+class TestAIService:
+    """Test cases for AI service helpers."""
+
+    @pytest.fixture
+    def service(self):
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+            return AIService()
+
+    def test_prepare_file_data_empty(self, service):
+        """Test empty scans encode as an empty JSON list."""
+        # Act
+        result = service._prepare_file_data([], [])
+        
+        # Assert
+        assert result == json.dumps([], indent=2)
+
+    def test_prepare_file_data_entries(self, service):
+        """Test folders come before files and names survive encoding."""
+        # Arrange
+        folders = [
+            {'id': 'd1', 'name': 'Résumés', 'parents': ['root']},
+            {'id': 'd2', 'parents': []}
+        ]
+        files = [
+            {'id': '1', 'name': 'naïve "quoted"\\name\n.txt', 'mimeType': 'text/plain', 'parents': ['d1']},
+            {'id': '2', 'name': '日本語.pdf'}
+        ]
+        
+        # Act
+        result = service._prepare_file_data(files, folders)
+        
+        # Assert
+        entries = json.loads(result)
+        assert result == json.dumps(entries, indent=2)
+        assert entries == [
+            {'id': 'd1', 'name': 'Résumés', 'type': 'folder', 'parent': 'root'},
+            {'id': 'd2', 'name': 'Unknown', 'type': 'folder', 'parent': 'root'},
+            {'id': '1', 'name': 'naïve "quoted"\\name\n.txt', 'type': 'file', 'mime_type': 'text/plain', 'parent': 'd1'},
+            {'id': '2', 'name': '日本語.pdf', 'type': 'file', 'mime_type': '', 'parent': 'root'}
+        ]
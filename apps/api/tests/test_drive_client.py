@@ -1,8 +1,14 @@
 """Unit tests for Google Drive client module."""
 
+import threading
+import httplib2
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from drive_client import build_service, list_files, move_item, DriveClientError
+from googleapiclient.errors import HttpError
+from drive_client import (
+    build_service, execute_request, list_files, move_item, move_items_batch, find_folders_batch,
+    create_folders_batch, escape_query_value, DriveClientError
+)
 
 
 class TestDriveClient:
@@ -31,7 +37,7 @@ class TestDriveClient:
         # Assert
         assert result == mock_service
         mock_credentials.assert_called_once()
-        mock_build.assert_called_once_with('drive', 'v3', credentials=mock_creds_instance)
+        mock_build.assert_called_once_with('drive', 'v3', credentials=mock_creds_instance, static_discovery=True, cache_discovery=False)
 
     def test_build_service_failure(self):
         """Test service building failure."""
@@ -107,6 +113,22 @@ class TestDriveClient:
         assert result['id'] == 'file_id'
         mock_service.files.return_value.update.assert_called_once()
 
+    def test_move_item_with_known_parents_skips_get(self):
+        """Test a move with prefetched parents sends only the update."""
+        # Arrange
+        mock_service = Mock()
+        mock_service.files.return_value.update.return_value.execute.return_value = {
+            'id': 'file_id',
+            'parents': ['new_parent']
+        }
+        
+        # Act
+        move_item(mock_service, 'file_id', 'new_parent', current_parents=['old_parent'])
+        
+        # Assert
+        mock_service.files.return_value.get.assert_not_called()
+        assert mock_service.files.return_value.update.call_args.kwargs['removeParents'] == 'old_parent'
+
     def test_move_item_failure(self):
         """Test file move failure."""
         # Arrange
@@ -115,4 +137,194 @@ class TestDriveClient:
         
         # Act & Assert
         with pytest.raises(DriveClientError):
-            move_item(mock_service, 'file_id', 'new_parent') 
\ No newline at end of file
+            move_item(mock_service, 'file_id', 'new_parent')
+
+    @patch('drive_client.AuthorizedHttp')
+    def test_execute_request_uses_authorized_transport(self, mock_authorized_http):
+        """Test requests are executed on an authorized transport."""
+        # Arrange
+        mock_request = Mock()
+        mock_request.execute.return_value = {'files': []}
+        
+        # Act
+        result = execute_request(mock_request)
+        
+        # Assert
+        assert result == {'files': []}
+        assert mock_authorized_http.call_args[0][0] == mock_request.http.credentials
+        mock_request.execute.assert_called_once_with(http=mock_authorized_http.return_value)
+
+    @patch('drive_client.AuthorizedHttp')
+    def test_execute_request_reuses_thread_connection(self, mock_authorized_http):
+        """Test each thread reuses its own HTTP connection across requests."""
+        # Arrange
+        mock_request = Mock()
+        
+        # Act
+        execute_request(mock_request)
+        execute_request(mock_request)
+        worker = threading.Thread(target=execute_request, args=(mock_request,))
+        worker.start()
+        worker.join()
+        
+        # Assert
+        thread_http = [call.kwargs['http'] for call in mock_authorized_http.call_args_list]
+        assert thread_http[0] is thread_http[1]
+        assert thread_http[2] is not thread_http[0]
+
+    @patch('drive_client.AuthorizedHttp')
+    def test_find_folders_batch_sends_one_batch(self, mock_authorized_http):
+        """Test folder lookups share one batch request."""
+        # Arrange
+        mock_service = Mock()
+        mock_batch = mock_service.new_batch_http_request.return_value
+        responses = [
+            {'files': [{'id': 'folder1', 'name': 'Docs'}]},
+            {'files': []},
+            None
+        ]
+        errors = [None, None, Exception("Backend error")]
+        
+        def execute(http=None):
+            callback = mock_service.new_batch_http_request.call_args.kwargs['callback']
+            for call, response, error in zip(mock_batch.add.call_args_list, responses, errors):
+                callback(call.kwargs['request_id'], response, error)
+        mock_batch.execute.side_effect = execute
+        
+        # Act
+        result = find_folders_batch(mock_service, ['Docs', 'Photos', "Bob's"])
+        
+        # Assert
+        assert result == {'Docs': 'folder1', 'Photos': None}
+        assert mock_batch.add.call_count == 3
+        mock_batch.execute.assert_called_once()
+        queries = [call.kwargs['q'] for call in mock_service.files.return_value.list.call_args_list]
+        assert queries[2].startswith("name='Bob\\'s'")
+
+    @patch('drive_client.AuthorizedHttp')
+    def test_create_folders_batch_failure(self, mock_authorized_http):
+        """Test a failed batch request raises DriveClientError."""
+        # Arrange
+        mock_service = Mock()
+        mock_service.new_batch_http_request.return_value.execute.side_effect = Exception("Connection reset")
+        
+        # Act & Assert
+        with pytest.raises(DriveClientError):
+            create_folders_batch(mock_service, ['Docs'])
+
+    @patch('drive_client.time.sleep')
+    @patch('drive_client.AuthorizedHttp')
+    def test_execute_request_retries_rate_limit(self, mock_authorized_http, mock_sleep):
+        """Test rate-limited requests are retried, honoring Retry-After."""
+        # Arrange
+        mock_request = Mock()
+        rate_limited = HttpError(httplib2.Response({'status': 429, 'retry-after': '3'}), b'')
+        mock_request.execute.side_effect = [rate_limited, {'id': 'file_id'}]
+        
+        # Act
+        result = execute_request(mock_request)
+        
+        # Assert
+        assert result == {'id': 'file_id'}
+        assert mock_request.execute.call_count == 2
+        mock_sleep.assert_called_once_with(3)
+
+    @patch('drive_client.time.sleep')
+    @patch('drive_client.AuthorizedHttp')
+    def test_execute_request_does_not_retry_permission_error(self, mock_authorized_http, mock_sleep):
+        """Test 403 errors other than rate limits are raised immediately."""
+        # Arrange
+        mock_request = Mock()
+        forbidden = HttpError(httplib2.Response({'status': 403}), b'{"error": {"errors": [{"reason": "insufficientPermissions"}]}}')
+        mock_request.execute.side_effect = forbidden
+        
+        # Act & Assert
+        with pytest.raises(HttpError):
+            execute_request(mock_request)
+        assert mock_request.execute.call_count == 1
+        mock_sleep.assert_not_called()
+
+    def test_escape_query_value(self):
+        """Test quotes and backslashes are escaped for Drive queries."""
+        # Act
+        result = escape_query_value("O'Brien \\ Q4 '24")
+        
+        # Assert
+        assert result == "O\\'Brien \\\\ Q4 \\'24"
+
+    @patch('drive_client.AuthorizedHttp')
+    def test_move_items_batch_reports_per_move_errors(self, mock_authorized_http):
+        """Test batched moves read parents, update, and report failures per move."""
+        # Arrange
+        mock_service = Mock()
+        batches = []
+        
+        def new_batch(callback):
+            batch = Mock()
+            batches.append(batch)
+            if len(batches) == 1:
+                outcomes = [({'parents': ['old1']}, None), (None, Exception("File not found"))]
+            else:
+                outcomes = [({'id': 'file1', 'parents': ['folder1']}, None)]
+            
+            def execute(http=None):
+                for call, (response, error) in zip(batch.add.call_args_list, outcomes):
+                    callback(call.kwargs['request_id'], response, error)
+            batch.execute.side_effect = execute
+            return batch
+        mock_service.new_batch_http_request.side_effect = new_batch
+        
+        # Act
+        errors = move_items_batch(mock_service, [('file1', 'folder1'), ('file2', 'folder1')])
+        
+        # Assert
+        assert errors[0] is None
+        assert "File not found" in errors[1]
+        assert len(batches) == 2
+        mock_service.files.return_value.update.assert_called_once_with(
+            fileId='file1',
+            addParents='folder1',
+            removeParents='old1',
+            fields='id, parents'
+        )
+
+    @patch('drive_client.time.sleep')
+    @patch('drive_client.AuthorizedHttp')
+    def test_execute_request_does_not_retry_create_server_error(self, mock_authorized_http, mock_sleep):
+        """Test a create answered with a 5xx is not re-sent, since it may have been applied."""
+        # Arrange
+        mock_request = Mock(method='POST')
+        mock_request.execute.side_effect = HttpError(httplib2.Response({'status': 500}), b'')
+        
+        # Act & Assert
+        with pytest.raises(HttpError):
+            execute_request(mock_request)
+        assert mock_request.execute.call_count == 1
+        mock_sleep.assert_not_called()
+
+    @patch('drive_client.time.sleep')
+    @patch('drive_client.AuthorizedHttp')
+    def test_create_folders_batch_does_not_resend_server_error(self, mock_authorized_http, mock_sleep):
+        """Test batched creates failing with a 5xx are reported, not re-sent."""
+        # Arrange
+        mock_service = Mock()
+        mock_service.files.return_value.create.return_value = Mock(method='POST')
+        mock_batch = mock_service.new_batch_http_request.return_value
+        outcomes = [
+            ({'id': 'folder1'}, None),
+            (None, HttpError(httplib2.Response({'status': 500}), b''))
+        ]
+        
+        def execute(http=None):
+            callback = mock_service.new_batch_http_request.call_args.kwargs['callback']
+            for call, (response, error) in zip(mock_batch.add.call_args_list, outcomes):
+                callback(call.kwargs['request_id'], response, error)
+        mock_batch.execute.side_effect = execute
+        
+        # Act
+        result = create_folders_batch(mock_service, ['Docs', 'Photos'])
+        
+        # Assert
+        assert result == {'Docs': 'folder1'}
+        mock_batch.execute.assert_called_once()
+        mock_sleep.assert_not_called()
@@ -0,0 +1,60 @@
+"""Unit tests for API endpoints in the main module."""
+
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+import httplib2
+import pytest
+from fastapi import HTTPException
+from unittest.mock import Mock, patch
+from googleapiclient.errors import HttpError
+
+# main creates its Supabase client at import time
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test.anon.key")
+
+import main
+from drive_client import DriveClientError
+
+
+class TestGoogleCredentialsCache:
+    """Test cases for cached Google credentials."""
+
+    @pytest.fixture
+    def cached_user(self):
+        user_id = "user-1"
+        valid_until = datetime.now(timezone.utc) + timedelta(minutes=10)
+        main._google_tokens_cache[user_id] = ({'access_token': 'revoked'}, valid_until)
+        main._drive_service_cache[user_id] = (Mock(), valid_until)
+        yield {"id": user_id}
+        main._invalidate_google_credentials(user_id)
+
+    def test_list_files_unauthorized_clears_cache(self, cached_user):
+        """Test a 401 from list_files drops the user's cached credentials."""
+        # Arrange
+        http_error = HttpError(httplib2.Response({'status': 401}), b'Invalid Credentials')
+        drive_error = DriveClientError(f"Drive API error: {http_error}")
+        
+        # Act
+        with patch('main.list_files', side_effect=drive_error):
+            with pytest.raises(HTTPException):
+                asyncio.run(main.get_drive_files(current_user=cached_user))
+        
+        # Assert
+        assert cached_user["id"] not in main._google_tokens_cache
+        assert cached_user["id"] not in main._drive_service_cache
+
+    def test_list_files_other_error_keeps_cache(self, cached_user):
+        """Test Drive errors other than 401 leave cached credentials alone."""
+        # Arrange
+        http_error = HttpError(httplib2.Response({'status': 404}), b'Not Found')
+        drive_error = DriveClientError(f"Drive API error: {http_error}")
+        
+        # Act
+        with patch('main.list_files', side_effect=drive_error):
+            with pytest.raises(HTTPException):
+                asyncio.run(main.get_drive_folders(current_user=cached_user))
+        
+        # Assert
+        assert cached_user["id"] in main._google_tokens_cache
+        assert cached_user["id"] in main._drive_service_cache
@@ -0,0 +1,44 @@
+-- Store scanned Drive items one row per file/folder instead of one JSON blob per scan.
+-- Scan data is regenerated by re-running a scan, so the old tables are replaced.
+DROP TABLE IF EXISTS drive_files CASCADE;
+DROP TABLE IF EXISTS drive_folders CASCADE;
+
+-- Drive files storage
+CREATE TABLE drive_files (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  scan_id uuid NOT NULL REFERENCES drive_scans(id) ON DELETE CASCADE,
+  user_id uuid REFERENCES auth.users(id) ON DELETE CASCADE,
+  drive_id text NOT NULL,
+  name text NOT NULL,
+  mime_type text,
+  size bigint,
+  parents text[] DEFAULT '{}',
+  created_time timestamptz,
+  modified_time timestamptz,
+  web_view_link text,
+  created_at timestamptz DEFAULT now()
+);
+
+-- Drive folders storage
+CREATE TABLE drive_folders (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  scan_id uuid NOT NULL REFERENCES drive_scans(id) ON DELETE CASCADE,
+  user_id uuid REFERENCES auth.users(id) ON DELETE CASCADE,
+  drive_id text NOT NULL,
+  name text NOT NULL,
+  parents text[] DEFAULT '{}',
+  created_time timestamptz,
+  modified_time timestamptz,
+  web_view_link text,
+  created_at timestamptz DEFAULT now()
+);
+
+-- Create indexes for better performance
+CREATE INDEX idx_drive_files_scan_id ON drive_files(scan_id, id);
+CREATE INDEX idx_drive_files_user_id ON drive_files(user_id);
+CREATE INDEX idx_drive_folders_scan_id ON drive_folders(scan_id, id);
+CREATE INDEX idx_drive_folders_user_id ON drive_folders(user_id);
+
+-- RLS stays disabled on these tables, matching 008_disable_rls_temp.sql
+COMMENT ON TABLE drive_files IS 'RLS temporarily disabled for OAuth flow testing';
+COMMENT ON TABLE drive_folders IS 'RLS temporarily disabled for OAuth flow testing';
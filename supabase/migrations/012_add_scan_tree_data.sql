@@ -0,0 +1,4 @@
+-- Store the folder tree built when a scan completes, so scan results
+-- don't rebuild it from drive_files/drive_folders on every request.
+-- Scans completed before this migration have NULL and are rebuilt on read.
+ALTER TABLE drive_scans ADD COLUMN IF NOT EXISTS tree_data jsonb;
@@ -0,0 +1,22 @@
+-- Store an AI proposal and mark its analysis completed in one round-trip.
+-- Both writes run in the function's transaction, so a poll never sees a
+-- completed analysis without its proposal.
+CREATE OR REPLACE FUNCTION finalize_ai_analysis(
+    p_analysis_id uuid,
+    p_scan_id uuid,
+    p_user_id uuid,
+    p_proposal jsonb
+) RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO ai_proposals (analysis_id, scan_id, user_id, proposal_data)
+    VALUES (p_analysis_id, p_scan_id, p_user_id, p_proposal);
+
+    UPDATE ai_analyses
+    SET status = 'completed',
+        progress = 100,
+        completed_at = NOW()
+    WHERE id = p_analysis_id;
+END;
+$$;